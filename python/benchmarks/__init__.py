@@ -0,0 +1 @@
+# benchmarks for the python implementation, run from the python folder eg python -m benchmarks.bench_dispatch
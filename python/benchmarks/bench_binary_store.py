@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Compare a day's update of a stored inventory through Item objects and through a mapped binary file.
+
+    python -m benchmarks.bench_binary_store --items 1000000
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from gilded_rose.gilded_rose import GildedRose
+from gilded_rose.binary_store import MappedInventory, write_inventory
+from gilded_rose.streaming import read_items, write_items
+from benchmarks.inventory import make_inventory
+
+
+def object_path(path):
+    """
+    Parse a CSV inventory into Item objects, update them and write them back.
+    :param path: The CSV file.
+    :return: None
+    """
+    with open(path, newline="", encoding="utf-8") as source:
+        items = list(read_items(source))
+    GildedRose(items).update_quality()
+    with open(path, "w", newline="", encoding="utf-8") as target:
+        write_items(items, target)
+
+
+def mapped_path(path):
+    """
+    Update a binary inventory file in place.
+    :param path: The binary file.
+    :return: None
+    """
+    with MappedInventory(path) as inventory:
+        inventory.update_quality()
+
+
+def best_time(function, path, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    items = make_inventory(args.items)
+    folder = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(folder, "inventory.csv")
+        binary_path = os.path.join(folder, "inventory.bin")
+        with open(csv_path, "w", newline="", encoding="utf-8") as target:
+            write_items(items, target)
+        write_inventory(binary_path, items)
+
+        objects = best_time(object_path, csv_path, args.repeat)
+        mapped = best_time(mapped_path, binary_path, args.repeat)
+        print("items            : %s" % args.items)
+        print("CSV + objects    : %.3f s (%.1f MiB file)" % (objects, os.path.getsize(csv_path) / 2 ** 20))
+        print("mapped binary    : %.3f s (%.1f MiB file)" % (mapped, os.path.getsize(binary_path) / 2 ** 20))
+        print("speed-up         : %.0fx" % (objects / mapped))
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
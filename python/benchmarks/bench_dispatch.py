@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the time taken and the handler objects created by GildedRose.update_quality.
+
+    python -m benchmarks.bench_dispatch --items 1000000
+"""
+import argparse
+import time
+
+from gilded_rose.gilded_rose import GildedRose, ItemHandler
+from benchmarks.inventory import make_inventory
+
+
+def measure(count, repeat):
+    """
+    Time update_quality over an inventory of the given size.
+    :param count: The number of items in the inventory.
+    :param repeat: The number of timed update_quality calls, the best one is reported.
+    :return: The best time in seconds
+    """
+    gilded_rose = GildedRose(make_inventory(count))
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gilded_rose.update_quality()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def count_handlers_created(count):
+    """
+    Count the ItemHandler objects created during one update_quality call.
+    :param count: The number of items in the inventory.
+    :return: int
+    """
+    gilded_rose = GildedRose(make_inventory(count))
+    created = [0]
+    original_new = ItemHandler.__new__
+
+    def counting_new(cls, *args, **kwargs):
+        created[0] += 1
+        return original_new(cls)
+
+    ItemHandler.__new__ = counting_new
+    try:
+        gilded_rose.update_quality()
+    finally:
+        ItemHandler.__new__ = original_new
+    return created[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    best = measure(args.items, args.repeat)
+    print("items            : %s" % args.items)
+    print("update_quality   : %.3f s (best of %s)" % (best, args.repeat))
+    print("per item         : %.1f ns" % (best / args.items * 1e9))
+    print("handlers created : %s" % count_handlers_created(args.items))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Report the resident memory used by an inventory of Item objects.
+
+    python -m benchmarks.bench_item_memory --items 10000000
+"""
+import argparse
+import resource
+import sys
+
+from benchmarks.inventory import make_inventory
+
+
+def max_rss_bytes():
+    """
+    Return the peak resident set size of this process in bytes.
+    :return: int
+    """
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000000)
+    args = parser.parse_args()
+
+    before = max_rss_bytes()
+    items = make_inventory(args.items)
+    after = max_rss_bytes()
+
+    print("items            : %s" % len(items))
+    print("process RSS      : %.1f MiB" % (after / 2 ** 20))
+    print("inventory RSS    : %.1f MiB" % ((after - before) / 2 ** 20))
+    print("per item         : %.1f bytes" % ((after - before) / len(items)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import random
+
+from gilded_rose.gilded_rose import Item
+
+# Names and relative frequencies of a realistic shop floor
+CATEGORY_MIX = [
+    ("+5 Dexterity Vest", 30),
+    ("Elixir of the Mongoose", 30),
+    ("Conjured", 10),
+    ("Aged Brie", 10),
+    ("Backstage passes to a TAFKAL80ETC concert", 15),
+    ("Sulfuras, Hand of Ragnaros", 5),
+]
+
+
+def make_inventory(count, seed=0):
+    """
+    Build a random inventory with the category mix in CATEGORY_MIX.
+    :param count: The number of items to build.
+    :param seed: Seed for the random generator, so runs are repeatable.
+    :return: A list of Item objects
+    """
+    generator = random.Random(seed)
+    names = generator.choices([name for name, _ in CATEGORY_MIX],
+                              weights=[weight for _, weight in CATEGORY_MIX], k=count)
+    return [Item(name, generator.randint(-5, 30), 80 if name.startswith("Sulfuras") else generator.randint(0, 50))
+            for name in names]
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Run the benchmark suite and optionally compare it with stored results.
+
+    python -m benchmarks.run_benchmarks --save benchmarks/results/latest.json
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json --threshold 20
+
+Each benchmark is timed over a freshly built inventory and the best of --repeat runs is
+reported. With --compare the run fails, with exit status 1, if any benchmark is more than
+--threshold percent slower than in the stored results.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, GildedRose
+from gilded_rose.report import write_report
+from benchmarks.inventory import make_inventory
+
+DAYS = 30
+
+
+def bench_update_quality(count):
+    gilded_rose = GildedRose(make_inventory(count))
+    return gilded_rose.update_quality
+
+
+def bench_simulation(count):
+    """
+    The texttest_fixture.main loop: print every item then update, for DAYS days.
+    """
+    items = make_inventory(count)
+
+    def simulate():
+        out = io.StringIO()
+        for day in range(DAYS + 1):
+            print("-------- day %s --------" % day, file=out)
+            print("name, sellIn, quality", file=out)
+            for item in items:
+                print(item, file=out)
+            print("", file=out)
+            GildedRose(items).update_quality()
+
+    return simulate
+
+
+def bench_report(count):
+    """
+    The same simulation written with gilded_rose.report.write_report.
+    """
+    items = make_inventory(count)
+
+    def simulate():
+        write_report(items, DAYS + 1, io.StringIO())
+
+    return simulate
+
+
+def bench_dispatch(count):
+    items = make_inventory(count)
+    handlers = DEFAULT_REGISTRY.handler_table()
+
+    def dispatch():
+        for item in items:
+            handlers[item.symbol.id]
+
+    return dispatch
+
+
+def bench_formatting(count):
+    items = make_inventory(count)
+
+    def format_items():
+        "\n".join(map(repr, items))
+
+    return format_items
+
+
+# name: (function building the timed callable for an inventory size, default sizes)
+BENCHMARKS = {
+    "update_quality": (bench_update_quality, [1000, 10000, 100000, 1000000]),
+    "simulation_30_days": (bench_simulation, [1000, 10000, 100000]),
+    "report_30_days": (bench_report, [1000, 10000, 100000]),
+    "dispatch": (bench_dispatch, [1000, 100000, 1000000]),
+    "formatting": (bench_formatting, [1000, 100000, 1000000]),
+}
+
+
+def run(names, sizes=None, repeat=3):
+    """
+    Run benchmarks and return the best time of each, in seconds.
+    :param names: The names of the benchmarks to run, from BENCHMARKS.
+    :param sizes: Inventory sizes to use instead of each benchmark's defaults.
+    :param repeat: The number of timed runs of each benchmark.
+    :return: A dict of "name[size]" to seconds
+    """
+    results = {}
+    for name in names:
+        build, default_sizes = BENCHMARKS[name]
+        for size in sizes or default_sizes:
+            best = float("inf")
+            for _ in range(repeat):
+                function = build(size)
+                start = time.perf_counter()
+                function()
+                best = min(best, time.perf_counter() - start)
+            results["%s[%s]" % (name, size)] = best
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+    :param results: A dict of benchmark key to seconds.
+    :param baseline: A dict of benchmark key to seconds from an earlier run.
+    :param threshold: The allowed slow-down, in percent.
+    :return: A list of (key, baseline seconds, seconds, percent change) for each
+        benchmark that is slower than allowed
+    """
+    regressions = []
+    for key, seconds in sorted(results.items()):
+        if key not in baseline:
+            continue
+        change = (seconds / baseline[key] - 1) * 100
+        if change > threshold:
+            regressions.append((key, baseline[key], seconds, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--benchmarks", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--sizes", nargs="+", type=int, help="inventory sizes, eg 1000 10000000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=25.0, help="allowed slow-down in percent")
+    args = parser.parse_args(argv)
+
+    results = run(args.benchmarks, args.sizes, args.repeat)
+    for key, seconds in results.items():
+        print("%-35s %10.6f s" % (key, seconds))
+
+    if args.save:
+        with open(args.save, "w") as out:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, out, indent=2, sort_keys=True)
+            out.write("\n")
+
+    if args.compare:
+        with open(args.compare) as source:
+            baseline = json.load(source)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for key, before, after, change in regressions:
+            print("REGRESSION %s: %.6f s -> %.6f s (+%.1f%%)" % (key, before, after, change))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
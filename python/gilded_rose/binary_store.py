@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed-width binary inventory files that are updated in place through mmap.
+
+Layout, all little-endian:
+
+    header      magic b"GRINV001", uint32 item count, uint32 name count,
+                uint64 name table size in bytes
+    name table  for each distinct name: uint8 category code, uint32 length,
+                UTF-8 bytes; padded with zero bytes to a multiple of 8
+    columns     uint32 name_index[item count], int32 sell_in[item count],
+                int32 quality[item count]
+"""
+import mmap
+import struct
+
+import numpy as np
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY
+from gilded_rose.columnar import SULFURAS, ColumnarInventory, advance_columns, category_of, update_columns
+
+MAGIC = b"GRINV001"
+HEADER = struct.Struct("<8sIIQ")
+NAME_ENTRY = struct.Struct("<BI")
+
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+
+# The rows updated at a time, in int64 copies of the mapped int32 columns
+BLOCK_SIZE = 2 ** 16
+
+
+def _padding(size):
+    return -size % 8
+
+
+def write_inventory(path, items, registry=DEFAULT_REGISTRY):
+    """
+    Write a list of Item objects to a binary inventory file.
+    :param path: The file to write.
+    :param items: A list of Item objects.
+    :param registry: The HandlerRegistry that gives each name its category code.
+    :return: None
+    """
+    inventory = ColumnarInventory.from_items(items, registry)
+    if inventory.schedule is not None:
+        raise ValueError("binary inventory files only store the default Backstage Passes tiers")
+    for column in (inventory.sell_in, inventory.quality):
+        if len(column) and (column.min() < INT32_MIN or column.max() > INT32_MAX):
+            raise ValueError("sell_in and quality must fit in 32 bits")
+
+    entries = []
+    for name in inventory.names:
+        encoded = name.encode("utf-8")
+        entries.append(NAME_ENTRY.pack(category_of(name, registry), len(encoded)) + encoded)
+    name_table = b"".join(entries)
+    with open(path, "wb") as out:
+        out.write(HEADER.pack(MAGIC, len(inventory), len(inventory.names), len(name_table)))
+        out.write(name_table)
+        out.write(b"\0" * _padding(len(name_table)))
+        out.write(inventory.name_index.astype("<u4").tobytes())
+        out.write(inventory.sell_in.astype("<i4").tobytes())
+        out.write(inventory.quality.astype("<i4").tobytes())
+
+
+def read_inventory(path):
+    """
+    Read a binary inventory file into a list of Item objects.
+    :param path: The file to read.
+    :return: A list of Item objects
+    """
+    with MappedInventory(path, writable=False) as inventory:
+        return inventory.to_items()
+
+
+class MappedInventory(object):
+
+    def __init__(self, path, writable=True):
+        """
+        Open a binary inventory file with mmap.
+
+        The sell_in and quality columns are NumPy arrays over the mapped file, so
+        update_quality and advance change the file in place. The update is worked out
+        in int64, BLOCK_SIZE rows at a time, so that it needs little memory beyond the
+        file. Quality only moves toward the 0 to 50 range, so only sell_in can leave the
+        file's int32 columns; if any would, the update is refused and the file is left
+        unchanged.
+
+        :param path: The file to open.
+        :param writable: Whether updates should be allowed.
+        :return: None
+        """
+        self.writable = writable
+        self._file = open(path, "r+b" if writable else "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+
+        if len(self._map) < HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError("%s is not a binary inventory file" % path)
+        _, count, name_count, name_table_size = HEADER.unpack_from(self._map, 0)
+
+        self.names = []
+        categories = []
+        offset = HEADER.size
+        for _ in range(name_count):
+            category, length = NAME_ENTRY.unpack_from(self._map, offset)
+            offset += NAME_ENTRY.size
+            self.names.append(self._map[offset:offset + length].decode("utf-8"))
+            categories.append(category)
+            offset += length
+
+        offset = HEADER.size + name_table_size + _padding(name_table_size)
+        self.name_index = np.frombuffer(self._map, dtype="<u4", count=count, offset=offset)
+        self.sell_in = np.frombuffer(self._map, dtype="<i4", count=count, offset=offset + 4 * count)
+        self.quality = np.frombuffer(self._map, dtype="<i4", count=count, offset=offset + 8 * count)
+        self.category = np.array(categories, dtype=np.int8)[self.name_index]
+
+    def update_quality(self):
+        """
+        Update every item in the file by one day, in place.
+        :return: None
+        """
+        self._update(1, update_columns)
+
+    def advance(self, days):
+        """
+        Update every item in the file by the given number of days, in place.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        if days > INT32_MAX - INT32_MIN:
+            # keep sell_in - days within int64: this many days takes every item but
+            # Sulfuras out of the int32 range anyway, and Sulfuras ignores the count
+            days = INT32_MAX - INT32_MIN + 1 if np.any(self.category != SULFURAS) else 1
+        self._update(days, advance_columns, days)
+
+    def _update(self, days, update, *args):
+        blocks = [slice(start, start + BLOCK_SIZE) for start in range(0, len(self), BLOCK_SIZE)]
+        # checked for every block before any is written, every item but Sulfuras loses days of sell_in
+        for block in blocks:
+            moving = self.sell_in[block][self.category[block] != SULFURAS]
+            if len(moving) and int(moving.min()) - days < INT32_MIN:
+                raise ValueError("sell_in would no longer fit in 32 bits, the file was left unchanged")
+        for block in blocks:
+            # int32 arithmetic could wrap in the middle of the update, eg Aged Brie's quality + days
+            sell_in = self.sell_in[block].astype(np.int64)
+            quality = self.quality[block].astype(np.int64)
+            update(self.category[block], sell_in, quality, *args)
+            self.sell_in[block] = sell_in
+            self.quality[block] = quality
+
+    def to_items(self):
+        """
+        Convert the inventory to a list of Item objects.
+        :return: A list of Item objects
+        """
+        return ColumnarInventory(self.names, self.name_index, self.sell_in, self.quality).to_items()
+
+    def flush(self):
+        """
+        Write changes to the mapped file back to disk.
+        :return: None
+        """
+        self._map.flush()
+
+    def close(self):
+        """
+        Flush and unmap the file. The column arrays must not be used afterwards.
+        :return: None
+        """
+        if self._map is None:
+            return
+        # drop the views over the map first, mmap refuses to close while they exist
+        self.name_index = self.sell_in = self.quality = None
+        if self.writable:
+            self._map.flush()
+        self._map.close()
+        self._map = None
+        self._file.close()
+
+    def __len__(self):
+        return len(self.category)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
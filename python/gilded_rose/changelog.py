@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Changelog output for inventory updates: instead of a full snapshot, one record per item
+whose state changed, with its position in the inventory and its old and new values.
+
+The binary form is a sequence of fixed-size little-endian records:
+
+    uint32 index, int32 old sell_in, int32 new sell_in, int32 old quality,
+    int32 new quality, uint8 event flags
+"""
+import struct
+from typing import NamedTuple
+
+EXPIRED = 1
+HIT_ZERO = 2
+HIT_MAX = 4
+
+EVENT_NAMES = {EXPIRED: "expired", HIT_ZERO: "hit 0", HIT_MAX: "hit 50"}
+
+RECORD = struct.Struct("<IiiiiB")
+
+
+class ItemChange(NamedTuple):
+    index: int
+    old_sell_in: int
+    new_sell_in: int
+    old_quality: int
+    new_quality: int
+    events: int
+
+    @property
+    def event_names(self):
+        """
+        The names of the events in this change, eg ["expired", "hit 0"].
+        :return: A list of strings
+        """
+        return [name for flag, name in EVENT_NAMES.items() if self.events & flag]
+
+
+def events_between(old_sell_in, new_sell_in, old_quality, new_quality):
+    """
+    Work out the category transitions of one item's update.
+    :return: int, EXPIRED, HIT_ZERO and HIT_MAX flags or-ed together
+    """
+    events = 0
+    if old_sell_in >= 0 > new_sell_in:
+        events |= EXPIRED
+    if new_quality == 0 != old_quality:
+        events |= HIT_ZERO
+    if new_quality == 50 != old_quality:
+        events |= HIT_MAX
+    return events
+
+
+def update_with_changes(gilded_rose, days=1):
+    """
+    Update every item of a GildedRose by the given number of days and generate an
+    ItemChange for each item whose sell-in or quality changed.
+
+    Items are updated as the generator is consumed, so consume it fully to update
+    the whole inventory.
+
+    :param gilded_rose: The GildedRose to update.
+    :param days: The number of days to advance.
+    :return: A generator of ItemChange, in inventory order
+    """
+    # checked here rather than in the generator, which would only run on the first next()
+    if days < 0:
+        raise ValueError("days must not be negative, got %s" % days)
+    return _generate_changes(gilded_rose, days)
+
+
+def _generate_changes(gilded_rose, days):
+    handlers = gilded_rose.registry.handler_table()
+    for index, item in enumerate(gilded_rose.items):
+        old_sell_in = item.sell_in
+        old_quality = item.quality
+        handler = handlers[item.symbol.id]
+        if days == 1:
+            handler.UpdateItem(item)
+        else:
+            handler.AdvanceItem(item, days)
+        if item.sell_in != old_sell_in or item.quality != old_quality:
+            yield ItemChange(index, old_sell_in, item.sell_in, old_quality, item.quality,
+                             events_between(old_sell_in, item.sell_in, old_quality, item.quality))
+
+
+def write_changes(changes, out):
+    """
+    Write changes to a binary file as fixed-size records.
+    :param changes: An iterable of ItemChange.
+    :param out: A binary file opened for writing.
+    :return: The number of records written
+    """
+    count = 0
+    pack = RECORD.pack
+    for change in changes:
+        out.write(pack(*change))
+        count += 1
+    return count
+
+
+def read_changes(source):
+    """
+    Read changes written by write_changes.
+    :param source: A binary file opened for reading.
+    :return: A generator of ItemChange
+    """
+    while True:
+        record = source.read(RECORD.size)
+        if not record:
+            return
+        if len(record) < RECORD.size:
+            raise ValueError("truncated changelog record")
+        yield ItemChange(*RECORD.unpack(record))
+
+
+def apply_changes(items, changes):
+    """
+    Apply changes to a copy of the inventory, eg on a read replica.
+    :param items: A list of Item objects, in the same order as when the changes were made.
+    :param changes: An iterable of ItemChange.
+    :return: None
+    """
+    for change in changes:
+        item = items[change.index]
+        item.sell_in = change.new_sell_in
+        item.quality = change.new_quality
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import re
+import sys
+
+from gilded_rose.gilded_rose import GildedRose
+from gilded_rose.binary_store import read_inventory, write_inventory
+from gilded_rose.report import render_day
+
+CHECKPOINT_NAME = "day-%09d.bin"
+# a checkpoint that knows where its day starts in the report, eg day-000000030-at-4096.bin
+CHECKPOINT_AT_NAME = "day-%09d-at-%d.bin"
+CHECKPOINT_PATTERN = re.compile(r"^day-(\d{9})(?:-at-(\d+))?\.bin$")
+PARTIAL_SUFFIX = ".tmp"
+
+
+def _fsync_directory(directory):
+    # makes a rename in the directory durable; Windows cannot open directories, and
+    # does not need this
+    if os.name == "nt":
+        return
+    handle = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(handle)
+    finally:
+        os.close(handle)
+
+
+def _report_offset(out):
+    # where the next day starts in the report, once everything before it is on disk;
+    # None for output that cannot be truncated back to it, like a terminal or a pipe
+    if not out.seekable():
+        return None
+    out.flush()
+    try:
+        os.fsync(out.fileno())
+    except io.UnsupportedOperation:
+        pass
+    return out.tell()
+
+
+class CheckpointedSimulation(object):
+
+    def __init__(self, directory, every=1, keep=2, registry=None):
+        """
+        Initialize a multi-day simulation that saves its inventory to a directory.
+
+        Every `every` days the inventory is written in the binary_store format to a
+        file named after the day it starts, eg day-000000030.bin. When the report goes
+        to a seekable file, the name also holds the position of that day in the report,
+        eg day-000000030-at-4096.bin, so that resume can cut the report back to it.
+        Files are written under a temporary name and renamed into place, so a crash
+        never leaves a partial checkpoint behind; temporary files left by a crash are
+        removed by the next run. Only the newest `keep` checkpoints are kept.
+
+        :param directory: The directory for checkpoint files, created if needed.
+        :param every: Save a checkpoint every this many days.
+        :param keep: The number of checkpoints to keep.
+        :param registry: The HandlerRegistry to pass to GildedRose.
+        :return: None
+        """
+        if every < 1 or keep < 1:
+            raise ValueError("every and keep must be at least 1")
+        self.directory = directory
+        self.every = every
+        self.keep = keep
+        self.registry = registry
+        os.makedirs(directory, exist_ok=True)
+
+    def checkpoints(self):
+        """
+        List the saved checkpoints, oldest first.
+        :return: A list of (day, path)
+        """
+        found = []
+        for name in os.listdir(self.directory):
+            match = CHECKPOINT_PATTERN.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def save(self, items, day, report_offset=None):
+        """
+        Atomically save the inventory as it is at the start of the given day.
+        :param items: A list of Item objects.
+        :param day: The day the items are ready for.
+        :param report_offset: Where the given day starts in the report, from out.tell(),
+            or None if the report cannot be truncated.
+        :return: The path of the checkpoint
+        """
+        name = CHECKPOINT_NAME % day if report_offset is None else CHECKPOINT_AT_NAME % (day, report_offset)
+        path = os.path.join(self.directory, name)
+        temporary = path + PARTIAL_SUFFIX
+        write_inventory(temporary, items)
+        with open(temporary, "rb+") as written:
+            os.fsync(written.fileno())
+        os.replace(temporary, path)
+        _fsync_directory(self.directory)
+        checkpoints = []
+        for old_day, old_path in self.checkpoints():
+            if old_day == day and old_path != path:
+                # the same day from an earlier run, with another report offset
+                os.remove(old_path)
+            else:
+                checkpoints.append((old_day, old_path))
+        for _, old_path in checkpoints[:-self.keep]:
+            os.remove(old_path)
+        return path
+
+    def load(self):
+        """
+        Load the newest checkpoint.
+        :return: A tuple of (day, list of Item objects, report offset or None), or None
+            if there is no checkpoint
+        """
+        checkpoints = self.checkpoints()
+        if not checkpoints:
+            return None
+        day, path = checkpoints[-1]
+        offset = CHECKPOINT_PATTERN.match(os.path.basename(path)).group(2)
+        return day, read_inventory(path), None if offset is None else int(offset)
+
+    def remove_partial(self):
+        """
+        Remove the temporary files of checkpoints that a crash left half written.
+        :return: None
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(PARTIAL_SUFFIX) and CHECKPOINT_PATTERN.match(name[:-len(PARTIAL_SUFFIX)]):
+                os.remove(os.path.join(self.directory, name))
+
+    def run(self, items, days, out=None, start_day=0):
+        """
+        Write the TextTest report for days start_day up to, but not including, days,
+        updating the items after each day and saving a checkpoint every `every` days.
+        :param items: A list of Item objects, as they are at the start of start_day.
+        :param days: The day to stop before.
+        :param out: A text file to write the report to, defaults to sys.stdout.
+        :param start_day: The first day to report.
+        :return: The list of items
+        """
+        out = sys.stdout if out is None else out
+        self.remove_partial()
+        gilded_rose = GildedRose(items, self.registry)
+        for day in range(start_day, days):
+            out.write(render_day(day, items))
+            gilded_rose.update_quality()
+            if (day + 1) % self.every == 0:
+                self.save(items, day + 1, _report_offset(out))
+        return items
+
+    def resume(self, items, days, out=None):
+        """
+        Continue the simulation from the newest checkpoint, or start it with the given
+        items if there is none.
+
+        Pass the report file the crashed run wrote to, opened for writing without
+        truncating it (eg mode "r+"). It is cut back to the start of the checkpoint's
+        day, so that the days the crashed run wrote after the checkpoint are not
+        repeated, and the finished report matches an uninterrupted run. When the
+        crashed run's output was not seekable, like sys.stdout, the report is written
+        from the checkpoint's day on, and the caller must drop the days from that day on
+        that the crashed run already wrote. A seekable report shorter than the checkpoint
+        expects raises ValueError.
+
+        :param items: A list of Item objects to start from when there is no checkpoint.
+        :param days: The day to stop before.
+        :param out: A text file to write the report to, defaults to sys.stdout.
+        :return: The list of items
+        """
+        loaded = self.load()
+        if loaded is None:
+            return self.run(items, days, out)
+        day, items, report_offset = loaded
+        out = sys.stdout if out is None else out
+        if report_offset is not None and out.seekable():
+            if out.seek(0, io.SEEK_END) < report_offset:
+                raise ValueError("the report is shorter than the checkpoint of day %s expects, "
+                                 "pass the report the crashed run wrote to" % day)
+            out.seek(report_offset)
+            out.truncate()
+        return self.run(items, days, out, start_day=day)
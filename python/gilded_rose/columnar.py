@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from gilded_rose.gilded_rose import (BACKSTAGE_INCREMENTS, BACKSTAGE_THRESHOLDS, AgedBrieItemHandler,
+                                     BackstagePassesItemHandler, ConjuredItemHandler, DEFAULT_REGISTRY, Item,
+                                     NormalItemHandler, SulfurasItemHandler)
+
+# Category codes - one per ItemHandler class in gilded_rose.py
+NORMAL = 0
+CONJURED = 1
+AGED_BRIE = 2
+BACKSTAGE_PASSES = 3
+SULFURAS = 4
+
+CATEGORY_BY_HANDLER = {
+    NormalItemHandler: NORMAL,
+    ConjuredItemHandler: CONJURED,
+    AgedBrieItemHandler: AGED_BRIE,
+    BackstagePassesItemHandler: BACKSTAGE_PASSES,
+    SulfurasItemHandler: SULFURAS,
+}
+
+
+def category_of(name, registry=DEFAULT_REGISTRY):
+    """
+    Return the category code for an item name, from the handler the registry
+    resolves it to, so names are matched exactly as GildedRose.get_ItemHandler
+    matches them.
+    :param name: The name of the item.
+    :param registry: The HandlerRegistry to resolve the name with.
+    :return: int category code
+    """
+    handler = registry.resolve(name)
+    try:
+        return CATEGORY_BY_HANDLER[type(handler)]
+    except KeyError:
+        raise ValueError("no columnar rules for %s, used for %r" % (type(handler).__name__, name)) from None
+
+
+# Sell-in values are clipped to this range when tiers are looked up, so that the thresholds
+# of each schedule can be moved into a band of their own of one sorted array
+SELL_IN_LIMIT = 2 ** 31
+SCHEDULE_SPAN = 2 * SELL_IN_LIMIT
+
+
+class TierTable(object):
+
+    def __init__(self, schedules=((BACKSTAGE_THRESHOLDS, BACKSTAGE_INCREMENTS),)):
+        """
+        Initialize a table of Backstage Passes tier schedules for array lookups.
+
+        Every schedule's thresholds are stored in one sorted array, schedule k's shifted
+        up by k * SCHEDULE_SPAN, so that one np.searchsorted call finds the tier of every
+        row whatever schedule it uses.
+
+        :param schedules: A sequence of (thresholds, increments) pairs, as taken by
+            BackstagePassesItemHandler. Rows refer to a schedule by its position.
+        :return: None
+        """
+        handlers = [BackstagePassesItemHandler(thresholds, increments) for thresholds, increments in schedules]
+        self.schedules = [(handler.thresholds, handler.increments) for handler in handlers]
+        self.keys = np.concatenate([
+            np.clip(np.array(handler.thresholds, dtype=np.int64), -SELL_IN_LIMIT, SELL_IN_LIMIT) + k * SCHEDULE_SPAN
+            for k, handler in enumerate(handlers)])
+        self.first_threshold = np.cumsum([0] + [len(handler.thresholds) for handler in handlers[:-1]])
+        self.first_increment = self.first_threshold + np.arange(len(handlers))
+        self.increments = np.concatenate([np.array(handler.increments, dtype=np.int64) for handler in handlers])
+
+        # the tiers as sell-in ranges, padded with empty tiers to the longest schedule
+        width = max(len(handler.tiers) for handler in handlers)
+        self.tier_increments = np.zeros((len(handlers), width), dtype=np.int64)
+        self.tier_lowest = np.ones((len(handlers), width), dtype=np.int64)
+        self.tier_highest = np.zeros((len(handlers), width), dtype=np.int64)
+        for k, handler in enumerate(handlers):
+            for j, (increment, lowest, highest) in enumerate(handler.tiers):
+                self.tier_increments[k, j] = increment
+                self.tier_lowest[k, j] = lowest
+                self.tier_highest[k, j] = SCHEDULE_SPAN if highest is None else highest
+
+    def __len__(self):
+        return len(self.schedules)
+
+    def increment(self, sell_in, schedule=None):
+        """
+        Return the daily quality increase for each row before the concert.
+        :param sell_in: Integer array of sell_in values.
+        :param schedule: Integer array of each row's schedule, or None if every row
+            uses schedule 0.
+        :return: Integer array
+        """
+        sell_in = np.clip(sell_in, -SELL_IN_LIMIT, SELL_IN_LIMIT - 1)
+        if schedule is None:
+            # schedule 0's band comes first, so the position is the tier
+            return self.increments[np.searchsorted(self.keys, sell_in, side="right")]
+        tier = np.searchsorted(self.keys, sell_in + schedule * SCHEDULE_SPAN, side="right") - self.first_threshold[schedule]
+        return self.increments[self.first_increment[schedule] + tier]
+
+    def increase(self, sell_in, days, schedule=None):
+        """
+        Return the total quality increase for each row over the given number of days,
+        for rows whose concert is not within those days. The count of days in every tier
+        is worked out for all rows at once, so the cost does not depend on which tier
+        each row is in.
+        :param sell_in: Integer array of sell_in values on the first day.
+        :param days: The number of days.
+        :param schedule: Integer array of each row's schedule, or None if every row
+            uses schedule 0.
+        :return: Integer array
+        """
+        row = 0 if schedule is None else schedule
+        total = np.zeros(len(sell_in), dtype=np.int64)
+        for j in range(self.tier_increments.shape[1]):
+            lowest = self.tier_lowest[row, j]
+            highest = self.tier_highest[row, j]
+            total += self.tier_increments[row, j] * count_sell_in_days(sell_in, days, lowest, highest)
+        return total
+
+
+DEFAULT_TIERS = TierTable()
+
+
+def update_columns(category, sell_in, quality, tiers=DEFAULT_TIERS, schedule=None):
+    """
+    Update one day of sell_in and quality columns in place.
+
+    Applies the rules of the ItemHandler classes as masked array operations.
+    The clamps are applied exactly as ItemHandler.increase_quality and
+    ItemHandler.decrease_quality apply them, so the result is identical to
+    running update_quality over the equivalent Item objects.
+
+    :param category: Array of category codes.
+    :param sell_in: Integer array of sell_in values, updated in place.
+    :param quality: Integer array of quality values, updated in place.
+    :param tiers: The TierTable for Backstage Passes rows.
+    :param schedule: Integer array of each row's schedule in tiers, or None if every
+        row uses schedule 0.
+    :return: None
+    """
+    # every rule looks at sell_in before it is decremented
+    expired = sell_in <= 0
+
+    degrading = (category == NORMAL) | (category == CONJURED)
+    step = np.where(expired, 2, 1)
+    step[category == CONJURED] *= 2
+    quality[degrading] = np.maximum(quality[degrading] - step[degrading], 0)
+
+    brie = category == AGED_BRIE
+    quality[brie] = np.minimum(quality[brie] + 1, 50)
+
+    passes = category == BACKSTAGE_PASSES
+    upcoming = passes & ~expired
+    increment = tiers.increment(sell_in[upcoming], None if schedule is None else schedule[upcoming])
+    quality[upcoming] = np.minimum(quality[upcoming] + increment, 50)
+    quality[passes & expired] = 0
+
+    sulfuras = category == SULFURAS
+    quality[sulfuras] = 80
+    sell_in -= 1
+    sell_in[sulfuras] = 0
+
+
+def count_sell_in_days(sell_in, days, lowest, highest=None):
+    """
+    Array version of gilded_rose.count_sell_in_days: for each row, count the days out
+    of the next given number of days on which the sell-in is between lowest and highest
+    inclusive.
+    :param sell_in: Integer array of sell_in values on the first day.
+    :param days: The number of days.
+    :param lowest: The lowest sell-in value to count.
+    :param highest: The highest sell-in value to count, or None for no limit.
+    :return: Integer array
+    """
+    top = sell_in if highest is None else np.minimum(sell_in, highest)
+    bottom = np.maximum(sell_in - days + 1, lowest)
+    return np.maximum(top - bottom + 1, 0)
+
+
+def advance_columns(category, sell_in, quality, days, tiers=DEFAULT_TIERS, schedule=None):
+    """
+    Update sell_in and quality columns in place by the given number of days.
+
+    Uses the same one step calculations as the AdvanceItem methods of the
+    ItemHandler classes, so the cost does not depend on the number of days.
+
+    :param category: Array of category codes.
+    :param sell_in: Integer array of sell_in values, updated in place.
+    :param quality: Integer array of quality values, updated in place.
+    :param days: The number of days to advance, 0 or more.
+    :param tiers: The TierTable for Backstage Passes rows.
+    :param schedule: Integer array of each row's schedule in tiers, or None if every
+        row uses schedule 0.
+    :return: None
+    """
+    if days <= 0:
+        return
+
+    fresh_days = count_sell_in_days(sell_in, days, 1)
+    expired_days = days - fresh_days
+
+    normal = category == NORMAL
+    decrease = fresh_days + 2 * expired_days
+    quality[normal] = np.maximum(quality[normal] - decrease[normal], 0)
+
+    conjured = category == CONJURED
+    decrease = 2 * fresh_days + 4 * expired_days
+    quality[conjured] = np.maximum(quality[conjured] - decrease[conjured], 0)
+
+    brie = category == AGED_BRIE
+    quality[brie] = np.minimum(quality[brie] + days, 50)
+
+    passes = category == BACKSTAGE_PASSES
+    after_concert = passes & (sell_in - days < 0)
+    upcoming = passes & ~after_concert
+    increase = tiers.increase(sell_in[upcoming], days, None if schedule is None else schedule[upcoming])
+    quality[upcoming] = np.minimum(quality[upcoming] + increase, 50)
+    quality[after_concert] = 0
+
+    sulfuras = category == SULFURAS
+    quality[sulfuras] = 80
+    sell_in -= days
+    sell_in[sulfuras] = 0
+
+
+class ColumnarInventory(object):
+
+    def __init__(self, names, name_index, sell_in, quality, registry=DEFAULT_REGISTRY):
+        """
+        Initialize a columnar inventory.
+
+        Item names are stored once in a name table and each row refers to its
+        name by position. The category of each row is derived from its name, and
+        so is the tier schedule of Backstage Passes rows.
+
+        :param names: A list of distinct item names.
+        :param name_index: Integer array, the position in names of each row's name.
+        :param sell_in: Integer array of sell_in values.
+        :param quality: Integer array of quality values.
+        :param registry: The HandlerRegistry that gives each name its category.
+        :return: None
+        """
+        self.names = list(names)
+        self.name_index = np.asarray(name_index, dtype=np.intp)
+        self.sell_in = np.asarray(sell_in, dtype=np.int64)
+        self.quality = np.asarray(quality, dtype=np.int64)
+        name_categories = np.array([category_of(name, registry) for name in self.names], dtype=np.int8)
+        self.category = name_categories[self.name_index]
+
+        schedules = {(BACKSTAGE_THRESHOLDS, BACKSTAGE_INCREMENTS): 0}
+        name_schedules = []
+        for name, category in zip(self.names, name_categories):
+            if category == BACKSTAGE_PASSES:
+                handler = registry.resolve(name)
+                name_schedules.append(schedules.setdefault((handler.thresholds, handler.increments), len(schedules)))
+            else:
+                name_schedules.append(0)
+        if len(schedules) == 1:
+            self.tiers = DEFAULT_TIERS
+            self.schedule = None
+        else:
+            self.tiers = TierTable(list(schedules))
+            self.schedule = np.array(name_schedules, dtype=np.intp)[self.name_index]
+
+    @classmethod
+    def from_items(cls, items, registry=DEFAULT_REGISTRY):
+        """
+        Build a columnar inventory from a list of Item objects.
+        :param items: A list of Item objects.
+        :param registry: The HandlerRegistry that gives each name its category.
+        :return: A ColumnarInventory
+        """
+        positions = {}
+        name_index = np.fromiter(
+            (positions.setdefault(item.symbol, len(positions)) for item in items),
+            dtype=np.intp, count=len(items))
+        sell_in = np.fromiter((item.sell_in for item in items), dtype=np.int64, count=len(items))
+        quality = np.fromiter((item.quality for item in items), dtype=np.int64, count=len(items))
+        names = [symbol.name for symbol in positions]
+        return cls(names, name_index, sell_in, quality, registry)
+
+    def to_items(self):
+        """
+        Convert the inventory back to a list of Item objects.
+        :return: A list of Item objects
+        """
+        names = self.names
+        return [Item(names[index], sell_in, quality)
+                for index, sell_in, quality
+                in zip(self.name_index.tolist(), self.sell_in.tolist(), self.quality.tolist())]
+
+    def update_quality(self):
+        """
+        Update the quality and sell-in of every row by one day.
+        :return: None
+        """
+        update_columns(self.category, self.sell_in, self.quality, self.tiers, self.schedule)
+
+    def advance(self, days):
+        """
+        Update the quality and sell-in of every row by the given number of days,
+        with the same result as calling update_quality that many times.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        advance_columns(self.category, self.sell_in, self.quality, days, self.tiers, self.schedule)
+
+    def __len__(self):
+        return len(self.name_index)
@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+"""
+Compare every update engine with the reference update_quality loop on random inventories.
+
+Each case is a small random inventory, a number of days and one of the REGISTRIES,
+which use exact names, prefixes, predicates and several Backstage Passes tier
+schedules. Some values are at the limits of 32-bit integers. The reference result is
+GildedRose.update_quality called once per day; every engine in ENGINES must give the
+same items, or raise Unsupported for a case it is not meant to handle. When an engine
+disagrees, or raises anything else, the case is shrunk to the smallest one that still
+fails, and that counterexample is reported. Cases are spread over a pool of worker
+processes:
+
+    python -m gilded_rose.differential --cases 1000000
+"""
+import argparse
+import io
+import os
+import random
+import struct
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Tuple
+
+from gilded_rose.gilded_rose import (ITEM_HANDLERS, NORMAL_ITEM_HANDLER, BackstagePassesItemHandler,
+                                     ConjuredItemHandler, DEFAULT_REGISTRY, GildedRose, Item, SulfurasItemHandler)
+from gilded_rose.binary_store import INT32_MAX, INT32_MIN, MappedInventory, read_inventory, write_inventory
+from gilded_rose.changelog import apply_changes, read_changes, update_with_changes, write_changes
+from gilded_rose.checkpoint import CheckpointedSimulation
+from gilded_rose.columnar import ColumnarInventory
+from gilded_rose.incremental import IncrementalGildedRose
+from gilded_rose.index import IndexedGildedRose
+from gilded_rose.parallel import ParallelGildedRose, pack_chunk, update_chunk
+from gilded_rose.registry import HandlerRegistry
+from gilded_rose.stats import UpdateStats
+from gilded_rose.streaming import read_items, update_items, write_items
+from gilded_rose.transition_cache import TransitionCache
+
+NAMES = [
+    "+5 Dexterity Vest",
+    "Elixir of the Mongoose",
+    "Conjured",
+    "Conjured Mana Cake",
+    "Aged Brie",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Sulfuras, Hand of Ragnaros",
+    'Quoted "name", with a comma',
+    "Mjölnir",
+    # only the rules of the other registries tell these apart from normal items
+    "Conjured Cheese",
+    "Backstage passes to Iron Maiden",
+    "Thunderfury (legendary)",
+    "Festival pass",
+    "Flat pass",
+]
+
+MAX_ITEMS = 8
+MAX_DAYS = 60
+BATCH_SIZE = 1000
+
+# The share of values taken from the boundaries below instead of the usual ranges
+BOUNDARY_RATE = 0.05
+SELL_IN_BOUNDARIES = (INT32_MIN, INT32_MIN + 1, INT32_MIN + 3, INT32_MAX - 2, INT32_MAX)
+QUALITY_BOUNDARIES = (INT32_MIN, INT32_MAX - 1, INT32_MAX)
+
+
+def is_legendary(name):
+    return name.endswith("(legendary)")
+
+
+def rules_registry():
+    """
+    A registry that matches Conjured items and Backstage passes by prefix, and
+    legendary items by predicate.
+    :return: A HandlerRegistry
+    """
+    registry = HandlerRegistry(NORMAL_ITEM_HANDLER, exact=ITEM_HANDLERS)
+    registry.register_prefix("Conjured", ConjuredItemHandler())
+    registry.register_prefix("Backstage passes", BackstagePassesItemHandler())
+    registry.register_predicate(is_legendary, SulfurasItemHandler())
+    return registry
+
+
+def tiers_registry():
+    """
+    The rules registry, with passes that follow two more tier schedules.
+    :return: A HandlerRegistry
+    """
+    registry = rules_registry()
+    registry.register_exact("Festival pass", BackstagePassesItemHandler((3, 8, 20), (5, 4, 2, 1)))
+    registry.register_exact("Flat pass", BackstagePassesItemHandler((), (1,)))
+    return registry
+
+
+# The registries a case can be updated with, by name
+REGISTRIES = {
+    "default": DEFAULT_REGISTRY,
+    "rules": rules_registry(),
+    "tiers": tiers_registry(),
+}
+
+
+class Unsupported(Exception):
+    """
+    Raised by an engine for a case it is not meant to handle, eg one with values
+    that do not fit its file format. The case is not counted as a failure.
+    """
+
+
+class Case(NamedTuple):
+    items: Tuple[Tuple[str, int, int], ...]
+    days: int
+    registry: str = "default"
+
+    @property
+    def size(self):
+        """
+        How big the case is, for picking the smallest of several counterexamples.
+        :return: A tuple that sorts smaller cases first
+        """
+        return (len(self.items), self.days,
+                sum(abs(sell_in) + abs(quality) for _, sell_in, quality in self.items))
+
+
+class Counterexample(NamedTuple):
+    engine: str
+    case: Case
+    expected: object
+    actual: object
+
+    def __str__(self):
+        lines = ["%s differs after %s days with the %s registry, starting from:"
+                 % (self.engine, self.case.days, self.case.registry)]
+        lines.extend("    %r" % (item,) for item in self.case.items)
+        lines.append("  expected %r" % (self.expected,))
+        lines.append("  got      %r" % (self.actual,))
+        return "\n".join(lines)
+
+
+def random_case(generator):
+    """
+    Make a random case, with values outside the usual ranges as well as inside them,
+    and now and then at the limits of 32-bit integers.
+    :param generator: A random.Random.
+    :return: A Case
+    """
+    items = tuple((generator.choice(NAMES), _value(generator, -30, 60, SELL_IN_BOUNDARIES),
+                   _value(generator, -5, 90, QUALITY_BOUNDARIES))
+                  for _ in range(generator.randint(0, MAX_ITEMS)))
+    return Case(items, generator.randint(0, MAX_DAYS), generator.choice(list(REGISTRIES)))
+
+
+def _value(generator, lowest, highest, boundaries):
+    if generator.random() < BOUNDARY_RATE:
+        return generator.choice(boundaries)
+    return generator.randint(lowest, highest)
+
+
+def case_at(seed, index):
+    """
+    Make the case with the given index in the sequence for the given seed. Every
+    process makes the same case for the same seed and index.
+    :return: A Case
+    """
+    return random_case(random.Random("%s-%s" % (seed, index)))
+
+
+def make_items(case):
+    return [Item(name, sell_in, quality) for name, sell_in, quality in case.items]
+
+
+def as_tuples(items):
+    return [(item.name, item.sell_in, item.quality) for item in items]
+
+
+def reference(case):
+    """
+    Update the case's items with the reference loop, one update_quality per day.
+    :param case: A Case.
+    :return: A list of (name, sell_in, quality) tuples
+    """
+    items = make_items(case)
+    gilded_rose = GildedRose(items, REGISTRIES[case.registry])
+    for _ in range(case.days):
+        gilded_rose.update_quality()
+    return as_tuples(items)
+
+
+def fits_32_bits(case):
+    """
+    Whether every value of the case, before and after the update, fits in a 32-bit
+    integer. Sell-in only goes down, and quality stays between its start value and the
+    0 to 50 range, so no value leaves 32 bits on the days in between either.
+    :param case: A Case.
+    :return: bool
+    """
+    values = [value for items in (case.items, reference(case)) for _, sell_in, quality in items
+              for value in (sell_in, quality)]
+    return all(INT32_MIN <= value <= INT32_MAX for value in values)
+
+
+def run_advance(case):
+    items = make_items(case)
+    GildedRose(items, REGISTRIES[case.registry]).advance(case.days)
+    return as_tuples(items)
+
+
+def run_columnar(case):
+    inventory = ColumnarInventory.from_items(make_items(case), REGISTRIES[case.registry])
+    for _ in range(case.days):
+        inventory.update_quality()
+    return as_tuples(inventory.to_items())
+
+
+def run_columnar_advance(case):
+    inventory = ColumnarInventory.from_items(make_items(case), REGISTRIES[case.registry])
+    inventory.advance(case.days)
+    return as_tuples(inventory.to_items())
+
+
+def run_parallel(case):
+    # the packed chunks the worker processes of ParallelGildedRose get, updated in this process
+    items = make_items(case)
+    sell_in, quality = update_chunk(pack_chunk(items), case.days, REGISTRIES[case.registry])
+    return [(item.name, item_sell_in, item_quality) for item, item_sell_in, item_quality in zip(items, sell_in, quality)]
+
+
+def run_parallel_gilded_rose(case):
+    # chunks of 3 items, so that most cases are split over the two worker processes;
+    # the pool is closed again, as a worker of run cannot exit while it has a pool of its own
+    items = make_items(case)
+    with ParallelGildedRose(items, workers=2, chunk_size=3, registry=REGISTRIES[case.registry]) as gilded_rose:
+        # one advance, as every update_quality is a round trip to the worker processes
+        gilded_rose.advance(case.days)
+    return as_tuples(items)
+
+
+def run_streaming(case):
+    text = io.StringIO()
+    write_items(make_items(case), text)
+    items = update_items(read_items(io.StringIO(text.getvalue())), case.days, chunk_size=3,
+                         registry=REGISTRIES[case.registry])
+    return as_tuples(items)
+
+
+def run_binary_store(case):
+    handle, path = tempfile.mkstemp(suffix=".bin")
+    os.close(handle)
+    try:
+        write_inventory(path, make_items(case), REGISTRIES[case.registry])
+        with MappedInventory(path) as inventory:
+            for _ in range(case.days):
+                inventory.update_quality()
+        return as_tuples(read_inventory(path))
+    except ValueError:
+        # the file only stores the default tiers and 32-bit values, and must refuse
+        # anything else rather than give other items
+        inventory = ColumnarInventory.from_items(make_items(case), REGISTRIES[case.registry])
+        if inventory.schedule is not None or not fits_32_bits(case):
+            raise Unsupported()
+        raise
+    finally:
+        os.remove(path)
+
+
+def run_incremental(case):
+    gilded_rose = IncrementalGildedRose(make_items(case), REGISTRIES[case.registry])
+    for _ in range(case.days):
+        gilded_rose.update_quality()
+    return as_tuples(gilded_rose.items)
+
+
+def run_transition_cache(case):
+    items = make_items(case)
+    TransitionCache(maxsize=4).advance(items, case.days, REGISTRIES[case.registry])
+    return as_tuples(items)
+
+
+def run_stats(case):
+    items = make_items(case)
+    gilded_rose = GildedRose(items, REGISTRIES[case.registry], stats=UpdateStats())
+    for _ in range(case.days):
+        gilded_rose.update_quality()
+    return as_tuples(items)
+
+
+def run_changelog(case):
+    gilded_rose = GildedRose(make_items(case), REGISTRIES[case.registry])
+    replica = make_items(case)
+    for _ in range(case.days):
+        out = io.BytesIO()
+        try:
+            write_changes(update_with_changes(gilded_rose), out)
+        except struct.error:
+            # the records hold 32-bit values
+            if not fits_32_bits(case):
+                raise Unsupported()
+            raise
+        apply_changes(replica, read_changes(io.BytesIO(out.getvalue())))
+    return as_tuples(replica)
+
+
+def run_index(case):
+    gilded_rose = IndexedGildedRose(make_items(case), REGISTRIES[case.registry])
+    for _ in range(case.days):
+        gilded_rose.update_quality()
+    return as_tuples(gilded_rose.items)
+
+
+def run_checkpoint(case):
+    # one checkpoint, of the last day: every save is fsynced, which would dominate the run
+    with tempfile.TemporaryDirectory() as directory:
+        simulation = CheckpointedSimulation(directory, every=max(case.days, 1), registry=REGISTRIES[case.registry])
+        try:
+            items = simulation.run(make_items(case), case.days, io.StringIO())
+        except ValueError:
+            # checkpoints are binary inventory files, with 32-bit values
+            if not fits_32_bits(case):
+                raise Unsupported()
+            raise
+        loaded = simulation.load()
+        return as_tuples(items if loaded is None else loaded[1])
+
+
+# The engines to compare with the reference loop, by name
+ENGINES = {
+    "advance": run_advance,
+    "columnar": run_columnar,
+    "columnar_advance": run_columnar_advance,
+    "parallel": run_parallel,
+    "parallel_gilded_rose": run_parallel_gilded_rose,
+    "streaming": run_streaming,
+    "binary_store": run_binary_store,
+    "incremental": run_incremental,
+    "transition_cache": run_transition_cache,
+    "stats": run_stats,
+    "changelog": run_changelog,
+    "index": run_index,
+    "checkpoint": run_checkpoint,
+}
+
+
+# What run_engine gives for a case the engine does not handle
+UNSUPPORTED = "unsupported"
+
+
+def run_engine(engine, case):
+    """
+    Run one engine on a case. An exception counts as a result, so that engines that
+    raise are reported like engines that give wrong items.
+    :param engine: A name in ENGINES.
+    :param case: A Case.
+    :return: A list of (name, sell_in, quality) tuples, UNSUPPORTED, or a description
+        of the exception
+    """
+    try:
+        return ENGINES[engine](case)
+    except Unsupported:
+        return UNSUPPORTED
+    except Exception as error:
+        return "%s: %s" % (type(error).__name__, error)
+
+
+def check(engine, case):
+    """
+    Compare one engine with the reference loop on a case.
+    :return: A Counterexample, or None if the engine gives the same items or does
+        not handle the case
+    """
+    expected = reference(case)
+    actual = run_engine(engine, case)
+    return None if actual in (expected, UNSUPPORTED) else Counterexample(engine, case, expected, actual)
+
+
+def _toward_zero(value):
+    candidates = [0, value // 2, value - 1 if value > 0 else value + 1]
+    return [candidate for i, candidate in enumerate(candidates)
+            if abs(candidate) < abs(value) and candidate not in candidates[:i]]
+
+
+def _smaller_cases(case):
+    items, days, registry = case
+    if registry != "default":
+        yield case._replace(registry="default")
+    for i in range(len(items)):
+        yield case._replace(items=items[:i] + items[i + 1:])
+    for smaller in _toward_zero(days):
+        yield case._replace(days=smaller)
+    if days:
+        # start a day later, from the items as they are after the first day
+        yield case._replace(items=tuple(reference(case._replace(days=1))), days=days - 1)
+    for i, (name, sell_in, quality) in enumerate(items):
+        for smaller in _toward_zero(sell_in):
+            yield case._replace(items=items[:i] + ((name, smaller, quality),) + items[i + 1:])
+        for smaller in _toward_zero(quality):
+            yield case._replace(items=items[:i] + ((name, sell_in, smaller),) + items[i + 1:])
+
+
+def shrink(counterexample):
+    """
+    Shrink a counterexample by going back to the default registry, dropping items,
+    moving the days toward 0, starting a day later and moving the items' values toward
+    0 for as long as the engine still fails.
+    :param counterexample: A Counterexample.
+    :return: The smallest Counterexample found
+    """
+    shrinking = True
+    while shrinking:
+        shrinking = False
+        for case in _smaller_cases(counterexample.case):
+            smaller = check(counterexample.engine, case)
+            if smaller is not None:
+                counterexample = smaller
+                shrinking = True
+                break
+    return counterexample
+
+
+def check_batch(seed, start, count, engines):
+    """
+    Check the cases with indexes start to start + count - 1 on the given engines.
+    This runs in the worker processes.
+    :return: A dict of engine name to its smallest shrunk Counterexample, for the engines that failed
+    """
+    failures = {}
+    for index in range(start, start + count):
+        case = case_at(seed, index)
+        expected = reference(case)
+        for engine in engines:
+            if engine in failures:
+                continue
+            actual = run_engine(engine, case)
+            if actual not in (expected, UNSUPPORTED):
+                failures[engine] = shrink(Counterexample(engine, case, expected, actual))
+    return failures
+
+
+def run(cases, seed=0, workers=None, engines=None, batch_size=BATCH_SIZE):
+    """
+    Check the given number of random cases on every engine, in batches spread over a
+    pool of worker processes.
+    :param cases: The number of cases to check.
+    :param seed: The seed the cases are made from.
+    :param workers: The number of worker processes, defaults to the number of CPUs.
+        With 1 the cases are checked in this process.
+    :param engines: The names of the engines to check, defaults to all of ENGINES.
+    :param batch_size: The number of cases a worker checks at a time.
+    :return: A list with the smallest Counterexample of every engine that failed
+    """
+    engines = list(ENGINES) if engines is None else list(engines)
+    unknown = [engine for engine in engines if engine not in ENGINES]
+    if unknown:
+        raise ValueError("unknown engines %s, expected some of %s" % (", ".join(unknown), ", ".join(ENGINES)))
+    starts = range(0, cases, batch_size)
+    counts = [min(batch_size, cases - start) for start in starts]
+
+    if workers == 1:
+        results = map(check_batch, [seed] * len(starts), starts, counts, [engines] * len(starts))
+        return _smallest(results)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(check_batch, [seed] * len(starts), starts, counts, [engines] * len(starts))
+        return _smallest(results)
+
+
+def _smallest(results):
+    smallest = {}
+    for failures in results:
+        for engine, counterexample in failures.items():
+            if engine not in smallest or counterexample.case.size < smallest[engine].case.size:
+                smallest[engine] = counterexample
+    return [smallest[engine] for engine in sorted(smallest)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES))
+    args = parser.parse_args(argv)
+
+    counterexamples = run(args.cases, args.seed, args.workers, args.engines)
+    for counterexample in counterexamples:
+        print(counterexample)
+    checked = len(args.engines or ENGINES)
+    print("%s cases, %s engines, %s failing" % (args.cases, checked, len(counterexamples)))
+    return 1 if counterexamples else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,38 +1,40 @@
 # -*- coding: utf-8 -*-
 
-import select
-from abc import ABC, ABCMeta, abstractmethod
-from tkinter import N
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+
+from gilded_rose.registry import HandlerRegistry
+from gilded_rose.symbols import SYMBOLS
 
 class GildedRose(object):
 
-    def __init__(self, items):
+    def __init__(self, items, registry=None, stats=None):
         """
         Initialize the GildedRose with a list of items.
         :param items: A list of Item objects representing the inventory.
+        :param registry: The HandlerRegistry that maps item names to handlers,
+            defaults to DEFAULT_REGISTRY.
+        :param stats: Optional gilded_rose.stats.UpdateStats to record counters and
+            timings in. Without it update_quality runs uninstrumented.
         :return: None
         """
+        self.registry = DEFAULT_REGISTRY if registry is None else registry
+        self.stats = stats
         self.items = items
 
     def get_ItemHandler(self, item):
         """
-        Returns an ItemHandler object corresponding to the type of item given.
+        Returns the ItemHandler corresponding to the type of item given.
+
+        Handlers are stateless, so one shared instance per item type is looked
+        up by the id of the item's name symbol in the registry instead of building a new
+        handler for every item.
 
         :param item: An Item object
         :return: An ItemHandler object
         """
-        match item.name:
-            case "Aged Brie":
-                return AgedBrieItemHandler(item)
-            case "Backstage passes to a TAFKAL80ETC concert":
-                return BackstagePassesItemHandler(item)
-            case "Sulfuras, Hand of Ragnaros":
-                return SulfurasItemHandler(item)
-            case "Conjured":
-                return ConjuredItemHandler(item)
-            case _:
-                return NormalItemHandler(item)
-            
+        return self.registry.handler_table()[item.symbol.id]
+
     def update_quality(self):
         """
         Update the quality of all items in the inventory.
@@ -43,10 +45,38 @@ class GildedRose(object):
 
         :return: None
         """
+        if self.stats is not None:
+            self.stats.record(self, "UpdateItem")
+            return
+        handlers = self.registry.handler_table()
         for item in self.items:
-            itemHandler = self.get_ItemHandler(item)
-            itemHandler.UpdateItem()
+            handlers[item.symbol.id].UpdateItem(item)
+
+    def advance(self, days):
+        """
+        Update all items in the inventory by the given number of days.
+
+        This gives the same result as calling update_quality the given number of times,
+        but each ItemHandler works out the item's state after all the days in one step,
+        so the cost does not depend on the number of days.
+
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        if self.stats is not None:
+            self.stats.record(self, "AdvanceItem", days)
+            return
+        handlers = self.registry.handler_table()
+        for item in self.items:
+            handlers[item.symbol.id].AdvanceItem(item, days)
+
 class Item:
+    # No per-instance __dict__: an Item only ever has these three attributes. The name is
+    # kept as its symbol in SYMBOLS, so items with the same name share one string
+    __slots__ = ("symbol", "sell_in", "quality")
+
     def __init__(self, name, sell_in, quality):
         """
         Initialize an item with given name, sell-in and quality.
@@ -56,99 +86,221 @@ class Item:
         :param quality: The quality of the item.
         :return: None
         """
-        self.name = name
+        self.symbol = SYMBOLS.intern(name)
         self.sell_in = sell_in
         self.quality = quality
 
+    @property
+    def name(self):
+        """
+        The name of the item, from its symbol.
+        :return: string
+        """
+        return self.symbol.name
+
+    @name.setter
+    def name(self, name):
+        self.symbol = SYMBOLS.intern(name)
+
+    @property
+    def name_id(self):
+        """
+        The id of the item's name in SYMBOLS, valid while the item has that name.
+        :return: int
+        """
+        return self.symbol.id
+
+    def __reduce__(self):
+        # name ids are only valid in this process, so pickle the name itself
+        return Item, (self.name, self.sell_in, self.quality)
+
     def __repr__(self):
         """
         Return a string representation of the item, which is in the format of
         "<name>, <sell_in>, <quality>"
         :return: string
         """
-        return "%s, %s, %s" % (self.name, self.sell_in, self.quality)
+        return "%s, %s, %s" % (self.symbol.name, self.sell_in, self.quality)
     
+def count_sell_in_days(sell_in, days, lowest, highest=None):
+    """
+    Count the days, out of the next given number of days, on which an item starting
+    at the given sell-in has a sell-in between lowest and highest inclusive.
+    The sell-in on those days is sell_in, sell_in - 1, ..., sell_in - days + 1.
+    :param sell_in: The sell-in value on the first day.
+    :param days: The number of days.
+    :param lowest: The lowest sell-in value to count.
+    :param highest: The highest sell-in value to count, or None for no limit.
+    :return: int
+    """
+    top = sell_in if highest is None else min(sell_in, highest)
+    bottom = max(sell_in - days + 1, lowest)
+    return max(top - bottom + 1, 0)
+
 class ItemHandler(ABC):
-    def __init__(self, item: Item):
-        """
-        Initialize the ItemHandler with a given item.
-        :param item: An instance of the Item class to be managed by the handler.
-        """
-        self.item = item
+    """
+    Base class for the update rules of one type of item.
+
+    Handlers hold no state of their own: the item to update is passed to every
+    method, so a single instance of each handler is shared by all items.
+    """
+
+    # How much the sell-in of an item changes per day once the item is settled
+    sell_in_step = -1
+
+    # Set on the instrumented copies of handlers that UpdateStats makes, to count clamp hits
+    stats = None
 
-    def increase_quality(self, amount=1):
+    def increase_quality(self, item, amount=1):
         """
-        Increase the quality of the managed item by the given amount.
+        Increase the quality of the given item by the given amount.
         The quality of an item can never be more than 50, so if the item's
         quality after the increase would be more than 50, it will be capped at 50.
+        :param item: The Item to update.
         :param amount: The amount to increase the quality by. Defaults to 1.
         :return: None
         """
-        self.item.quality = min(self.item.quality + amount, 50)
+        quality = item.quality + amount
+        if quality > 50:
+            quality = 50
+            if self.stats is not None:
+                self.stats.clamp_hits[50] += 1
+        item.quality = quality
 
-    def decrease_quality(self, amount=1):
+    def decrease_quality(self, item, amount=1):
         """
-        Decrease the quality of the managed item by the given amount.
+        Decrease the quality of the given item by the given amount.
         The quality of an item can never be less than 0, so if the item's
         quality after the decrease would be less than 0, it will be capped at 0.
+        :param item: The Item to update.
         :param amount: The amount to decrease the quality by. Defaults to 1.
         :return: None
         """
-        self.item.quality = max(self.item.quality - amount, 0)
+        quality = item.quality - amount
+        if quality < 0:
+            quality = 0
+            if self.stats is not None:
+                self.stats.clamp_hits[0] += 1
+        item.quality = quality
 
-    def decrement_sell_in(self):
+    def decrement_sell_in(self, item):
         """
-        Decrement the sell-in of the managed item by 1.
+        Decrement the sell-in of the given item by 1.
         This is called by the UpdateItem method of the ItemHandler classes.
+        :param item: The Item to update.
         :return: None
         """
-        self.item.sell_in -= 1
+        item.sell_in -= 1
+
+    def is_settled(self, item):
+        """
+        Return True if the item's quality can no longer change, so that from now on
+        updating it only changes its sell-in by sell_in_step per day.
+        Handlers that do not override this never report their items as settled.
+        :param item: The Item to check.
+        :return: bool
+        """
+        return False
+
+    def AdvanceItem(self, item, days):
+        """
+        Update the given item by the given number of days.
+        The concrete ItemHandler classes override this with a calculation that does not
+        depend on the number of days; this version calls UpdateItem once per day.
+        :param item: The Item to update.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        for _ in range(days):
+            self.UpdateItem(item)
 
     # Abstract method - different ItemHandler types which inherit from this class will each update differently
     @abstractmethod
-    def UpdateItem(self):
+    def UpdateItem(self, item):
         """
         Abstract method to be implemented by the concrete ItemHandler classes.
         This method is called by the update_quality method of the GildedRose class.
-        It should update the quality and sell-in of the managed item according to
+        It should update the quality and sell-in of the given item according to
         the item's type and current state.
+        :param item: The Item to update.
         :return: None
         """
         pass
 
-class NormalItemHandler(ItemHandler):    
-    def UpdateItem(self):
+class NormalItemHandler(ItemHandler):
+    def UpdateItem(self, item):
         """
         Update the quality and sell-in of a normal item.
         This method decreases the sell-in value by 1. If the sell-in value is less
         than 0, it decreases the quality by 2. Otherwise, it decreases the quality
         by 1. The quality is never allowed to go below 0.
         """
-        if self.item.sell_in <= 0:        
-            self.decrease_quality(amount=2)
+        if item.sell_in <= 0:
+            self.decrease_quality(item, amount=2)
         else:
-            self.decrease_quality(amount=1) 
-        
+            self.decrease_quality(item, amount=1)
+
         # decrement the sell_in value after the quality calculations
-        self.decrement_sell_in()        
+        self.decrement_sell_in(item)
+
+    def is_settled(self, item):
+        """
+        A normal item's quality stays at 0 once it gets there.
+        :return: bool
+        """
+        return item.quality == 0
+
+    def AdvanceItem(self, item, days):
+        """
+        Update a normal item by the given number of days in one step.
+        The quality decreases by 1 for each day with a sell-in above 0 and by 2 for
+        every other day. As the quality only ever decreases, clamping the total at 0
+        gives the same result as clamping each day.
+        :return: None
+        """
+        if days <= 0:
+            return
+        fresh_days = count_sell_in_days(item.sell_in, days, 1)
+        self.decrease_quality(item, amount=fresh_days + 2 * (days - fresh_days))
+        item.sell_in -= days
 
-class ConjuredItemHandler(ItemHandler):    
-    def UpdateItem(self):
+class ConjuredItemHandler(ItemHandler):
+    def UpdateItem(self, item):
         """
         Update the quality and sell-in of a conjured item.
         "Conjured" items degrade in Quality twice as fast as normal items. If the sell-in value is less
         than 0, it decreases the quality by 4. Otherwise, it decreases the quality
         by 2. The quality is never allowed to go below 0.
         """
-        if self.item.sell_in <= 0:        
-            self.decrease_quality(amount=4)
+        if item.sell_in <= 0:
+            self.decrease_quality(item, amount=4)
         else:
-            self.decrease_quality(amount=2) 
+            self.decrease_quality(item, amount=2)
 
-        self.decrement_sell_in()                
+        self.decrement_sell_in(item)
+
+    def is_settled(self, item):
+        """
+        A conjured item's quality stays at 0 once it gets there.
+        :return: bool
+        """
+        return item.quality == 0
+
+    def AdvanceItem(self, item, days):
+        """
+        Update a conjured item by the given number of days in one step.
+        The quality decreases by 2 for each day with a sell-in above 0 and by 4 for
+        every other day, clamped at 0.
+        :return: None
+        """
+        if days <= 0:
+            return
+        fresh_days = count_sell_in_days(item.sell_in, days, 1)
+        self.decrease_quality(item, amount=2 * fresh_days + 4 * (days - fresh_days))
+        item.sell_in -= days
 
 class AgedBrieItemHandler(ItemHandler):
-    def UpdateItem(self):        
+    def UpdateItem(self, item):
         """
         Update the quality and sell-in of an Aged Brie item.
         This method increases the quality by 1 and decreases the sell-in value by 1.
@@ -156,11 +308,31 @@ class AgedBrieItemHandler(ItemHandler):
         increase would be more than 50, it will be capped at 50.
         :return: None
         """
-        self.increase_quality()        
-        self.decrement_sell_in()
+        self.increase_quality(item)
+        self.decrement_sell_in(item)
+
+    def is_settled(self, item):
+        """
+        Aged Brie's quality stays at 50 once it gets there.
+        :return: bool
+        """
+        return item.quality == 50
+
+    def AdvanceItem(self, item, days):
+        """
+        Update an Aged Brie item by the given number of days in one step.
+        The quality increases by 1 per day, clamped at 50.
+        :return: None
+        """
+        if days <= 0:
+            return
+        self.increase_quality(item, amount=days)
+        item.sell_in -= days
 
 class SulfurasItemHandler(ItemHandler):
-    def UpdateItem(self):
+    sell_in_step = 0
+
+    def UpdateItem(self, item):
         """
         Update the quality and sell-in of a Sulfuras item.
         This method does not make any changes to the quality or sell-in of the item, as
@@ -168,33 +340,109 @@ class SulfurasItemHandler(ItemHandler):
         Default the sell_in to 0 since the item never has to be sold.
         :return: None
         """
-        self.item.quality = 80
-        self.item.sell_in = 0
+        item.quality = 80
+        item.sell_in = 0
+
+    def is_settled(self, item):
+        """
+        Sulfuras never changes again once it has been updated to a sell-in of 0 and
+        a quality of 80.
+        :return: bool
+        """
+        return item.sell_in == 0 and item.quality == 80
+
+    def AdvanceItem(self, item, days):
+        """
+        Update a Sulfuras item by the given number of days. Sulfuras is the same after
+        any number of days as it is after one.
+        :return: None
+        """
+        if days > 0:
+            self.UpdateItem(item)
+
+# Backstage pass tiers: a pass with a sell-in below BACKSTAGE_THRESHOLDS[i] (and not below
+# the threshold before it) gains BACKSTAGE_INCREMENTS[i] quality a day, and one with a
+# sell-in of BACKSTAGE_THRESHOLDS[-1] or more gains BACKSTAGE_INCREMENTS[-1]
+BACKSTAGE_THRESHOLDS = (6, 11)
+BACKSTAGE_INCREMENTS = (3, 2, 1)
 
 class BackstagePassesItemHandler(ItemHandler):
-    def UpdateItem(self): 
+    def __init__(self, thresholds=BACKSTAGE_THRESHOLDS, increments=BACKSTAGE_INCREMENTS):
+        """
+        Initialize a Backstage Passes handler with a tier schedule.
+        :param thresholds: Strictly increasing sell-in values where a new tier starts.
+        :param increments: The daily quality increase for each tier, one more than there
+            are thresholds, none of them negative.
+        :return: None
+        """
+        thresholds = tuple(thresholds)
+        increments = tuple(increments)
+        if any(lower >= upper for lower, upper in zip(thresholds, thresholds[1:])):
+            raise ValueError("thresholds must be strictly increasing, got %s" % (thresholds,))
+        if len(increments) != len(thresholds) + 1:
+            raise ValueError("expected %s increments for %s thresholds, got %s"
+                             % (len(thresholds) + 1, len(thresholds), len(increments)))
+        if any(increment < 0 for increment in increments):
+            raise ValueError("increments must not be negative, got %s" % (increments,))
+        self.thresholds = thresholds
+        self.increments = increments
+        # the same schedule as (increment, lowest, highest) sell-in ranges of the days before
+        # the concert, with highest None for the last tier
+        lowest = (1,) + tuple(max(threshold, 1) for threshold in thresholds)
+        highest = tuple(threshold - 1 for threshold in thresholds) + (None,)
+        self.tiers = tuple(zip(increments, lowest, highest))
+
+    def UpdateItem(self, item):
         """
         Update the quality and sell-in of a Backstage Passes item.
         This method decreases the sell-in value by 1. If the sell-in value is greater than 0,
-        it increases the quality by 3 when there are 5 days or less to the concert, by 2 when
-        there are 10 days or less, and by 1 otherwise. If the sell-in value is less than 0, 
-        the quality drops to 0. The quality is never allowed to exceed 50.
-        :return: None
-        """      
-        # quality increases by 3 when there are 5 days or less to the concert
-        # or quality increases by 2 when there are 10 days or less to the concert
-        if self.item.sell_in > 0:
-            if self.item.sell_in < 6:            
-                self.increase_quality(amount=3)         
-            elif self.item.sell_in < 11:
-                self.increase_quality(amount=2)
-            else:
-                self.increase_quality(amount=1)
-            
-
-        # quality of the backstage passes to the concert drops to 0 after the concert         
-        if self.item.sell_in <= 0:
-            self.item.quality = 0
+        it increases the quality by the increment of the tier the sell-in falls in, which
+        by default is 3 when there are 5 days or less to the concert, 2 when there are 10
+        days or less, and 1 otherwise. If the sell-in value is less than 0, the quality
+        drops to 0. The quality is never allowed to exceed 50.
+        :return: None
+        """
+        if item.sell_in > 0:
+            self.increase_quality(item, amount=self.increments[bisect_right(self.thresholds, item.sell_in)])
+
+        # quality of the backstage passes to the concert drops to 0 after the concert
+        if item.sell_in <= 0:
+            item.quality = 0
 
         # decrement the sell_in value after the quality calculations
-        self.decrement_sell_in()        
\ No newline at end of file
+        self.decrement_sell_in(item)
+
+    def is_settled(self, item):
+        """
+        Backstage passes stay at a quality of 0 after the concert.
+        :return: bool
+        """
+        return item.sell_in <= 0 and item.quality == 0
+
+    def AdvanceItem(self, item, days):
+        """
+        Update a Backstage Passes item by the given number of days in one step.
+        If the concert happens within the given days the quality ends at 0. Otherwise the
+        increases for the days in each tier are added up and the total is clamped at 50.
+        :return: None
+        """
+        if days <= 0:
+            return
+        if item.sell_in - days < 0:
+            item.quality = 0
+        else:
+            self.increase_quality(item, amount=sum(increment * count_sell_in_days(item.sell_in, days, lowest, highest)
+                                                   for increment, lowest, highest in self.tiers))
+        item.sell_in -= days
+
+# Shared handler instances, looked up by item name through DEFAULT_REGISTRY
+NORMAL_ITEM_HANDLER = NormalItemHandler()
+
+ITEM_HANDLERS = {
+    "Aged Brie": AgedBrieItemHandler(),
+    "Backstage passes to a TAFKAL80ETC concert": BackstagePassesItemHandler(),
+    "Sulfuras, Hand of Ragnaros": SulfurasItemHandler(),
+    "Conjured": ConjuredItemHandler(),
+}
+
+DEFAULT_REGISTRY = HandlerRegistry(NORMAL_ITEM_HANDLER, exact=ITEM_HANDLERS)
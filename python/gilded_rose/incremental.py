@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from gilded_rose.gilded_rose import GildedRose
+
+
+class IncrementalGildedRose(GildedRose):
+
+    def __init__(self, items, registry=None):
+        """
+        Initialize a GildedRose that only visits items whose quality can still change.
+
+        Once an item's handler reports it as settled (see ItemHandler.is_settled) its
+        quality is final and only its sell-in keeps moving, by the handler's
+        sell_in_step per day. Settled items are moved out of the daily update: their
+        sell-in is worked out from the day counter when the items are read, so the
+        cost of update_quality depends on the number of active items only.
+
+        Read and replace the inventory through the items attribute as usual. To change
+        items from outside, read them through the items attribute (or call sync) first,
+        and call rebucket after the changes, before the next update.
+
+        :param items: A list of Item objects representing the inventory.
+        :param registry: The HandlerRegistry that maps item names to handlers.
+        :return: None
+        """
+        self.day = 0
+        self._drifting = []
+        super().__init__(items, registry)
+
+    @property
+    def items(self):
+        """
+        The inventory, with the sell-in of settled items brought up to date.
+        :return: A list of Item objects
+        """
+        self.sync()
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = items
+        self.rebucket()
+
+    def rebucket(self):
+        """
+        Sort every item into the active or the settled bucket again, eg after items
+        were changed from outside. The items' values are taken as they are, so bring
+        them up to date with sync, or by reading the items attribute, before changing
+        them.
+        :return: None
+        """
+        self._active = []
+        # settled items whose sell-in still moves, as (item, handler's sell_in_step, sell-in on day 0)
+        self._drifting = []
+        handlers = self.registry.handler_table()
+        for item in self._items:
+            self._place(item, handlers[item.symbol.id])
+
+    def _place(self, item, handler):
+        if not handler.is_settled(item):
+            self._active.append(item)
+        elif handler.sell_in_step:
+            self._drifting.append((item, handler.sell_in_step, item.sell_in - handler.sell_in_step * self.day))
+
+    def sync(self):
+        """
+        Bring the sell-in of the settled items up to date, without returning them.
+        :return: None
+        """
+        day = self.day
+        for item, step, start in self._drifting:
+            item.sell_in = start + step * day
+
+    @property
+    def active_count(self):
+        """
+        The number of items that are still updated every day.
+        :return: int
+        """
+        return len(self._active)
+
+    def update_quality(self):
+        """
+        Update the active items by one day and move the ones that settle out of the
+        daily update.
+        :return: None
+        """
+        self.day += 1
+        handlers = self.registry.handler_table()
+        active = self._active
+        self._active = []
+        for item in active:
+            handler = handlers[item.symbol.id]
+            handler.UpdateItem(item)
+            self._place(item, handler)
+
+    def advance(self, days):
+        """
+        Update the active items by the given number of days, then sort them into
+        buckets again.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        self.day += days
+        handlers = self.registry.handler_table()
+        active = self._active
+        self._active = []
+        for item in active:
+            handler = handlers[item.symbol.id]
+            handler.AdvanceItem(item, days)
+            self._place(item, handler)
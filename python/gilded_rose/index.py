@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import islice
+
+from gilded_rose.gilded_rose import GildedRose
+
+
+class ItemView(Sequence):
+    """
+    A read-only window onto a slice of one of the index's item lists, made without
+    copying the items. The window is fixed when the query runs; use it before the
+    next update.
+    """
+
+    __slots__ = ("_items", "_start", "_stop")
+
+    def __init__(self, items, start=0, stop=None):
+        self._items = items
+        self._start = start
+        self._stop = len(items) if stop is None else stop
+
+    def __len__(self):
+        return max(self._stop - self._start, 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return ItemView(self._items, self._start + start, self._start + max(stop, start))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ItemView index out of range")
+        return self._items[self._start + index]
+
+    def __iter__(self):
+        return islice(self._items, self._start, self._stop)
+
+    def __repr__(self):
+        return "ItemView(%r)" % list(self)
+
+
+EMPTY_VIEW = ItemView([])
+
+
+class _Partition(object):
+    """
+    The items of one handler, sorted by sell-in, with their quality buckets.
+
+    For handlers that take 1 off the sell-in every day (sell_in_step of -1) the sort
+    key is sell_in + day, which does not change as the days pass, so the order is
+    built once. Other handlers, like Sulfuras, are sorted by sell-in again after
+    each update.
+
+    Most items change quality every day, so moving each one between buckets during
+    the update would cost more than the update itself. Instead the buckets are
+    dropped by the update and built again by the first quality query after it.
+    """
+
+    __slots__ = ("shifts", "keys", "items", "by_quality")
+
+    def __init__(self, handler, items, day):
+        self.shifts = handler.sell_in_step == -1
+        self.by_quality = None
+        self.sort(items, day)
+
+    def offset(self, day):
+        return day if self.shifts else 0
+
+    def sort(self, items, day):
+        offset = self.offset(day)
+        items = sorted(items, key=lambda item: item.sell_in)
+        self.items = items
+        self.keys = [item.sell_in + offset for item in items]
+
+    def quality_buckets(self):
+        if self.by_quality is None:
+            by_quality = self.by_quality = {}
+            for item in self.items:
+                bucket = by_quality.get(item.quality)
+                if bucket is None:
+                    by_quality[item.quality] = [item]
+                else:
+                    bucket.append(item)
+        return self.by_quality
+
+
+class IndexedGildedRose(GildedRose):
+
+    def __init__(self, items, registry=None):
+        """
+        Initialize a GildedRose that keeps its items indexed by handler, sell-in and
+        quality, so that questions like "all backstage passes with a sell-in below 6"
+        are answered without scanning the inventory.
+
+        The sell-in index is kept up to date by update_quality and advance. If an item is
+        changed from outside, call reindex before the next query.
+
+        :param items: A list of Item objects representing the inventory.
+        :param registry: The HandlerRegistry that maps item names to handlers.
+        :return: None
+        """
+        self.day = 0
+        super().__init__(items, registry)
+
+    @property
+    def items(self):
+        """
+        The inventory.
+        :return: A list of Item objects
+        """
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = items
+        self.reindex()
+
+    def reindex(self):
+        """
+        Build the indexes again from the items, eg after items were changed from outside.
+        :return: None
+        """
+        grouped = {}
+        handlers = self.registry.handler_table()
+        for item in self._items:
+            grouped.setdefault(handlers[item.symbol.id], []).append(item)
+        self._partitions = {handler: _Partition(handler, items, self.day) for handler, items in grouped.items()}
+
+    def _partition(self, name):
+        return self._partitions.get(self.registry.handlers[name])
+
+    def category(self, name):
+        """
+        Return the items handled like the item with the given name, by ascending sell-in.
+        :param name: An item name, eg "Aged Brie".
+        :return: An ItemView
+        """
+        partition = self._partition(name)
+        return EMPTY_VIEW if partition is None else ItemView(partition.items)
+
+    def sell_in_between(self, name, lowest=None, highest=None):
+        """
+        Return the items handled like the item with the given name that have a sell-in
+        between lowest and highest inclusive, by ascending sell-in.
+        :param name: An item name, eg "Backstage passes to a TAFKAL80ETC concert".
+        :param lowest: The lowest sell-in to include, or None for no limit.
+        :param highest: The highest sell-in to include, or None for no limit.
+        :return: An ItemView
+        """
+        partition = self._partition(name)
+        if partition is None:
+            return EMPTY_VIEW
+        offset = partition.offset(self.day)
+        keys = partition.keys
+        start = 0 if lowest is None else bisect_left(keys, lowest + offset)
+        stop = len(keys) if highest is None else bisect_right(keys, highest + offset)
+        return ItemView(partition.items, start, stop)
+
+    def with_quality(self, name, quality):
+        """
+        Return the items handled like the item with the given name that have the given
+        quality, eg 50 for Aged Brie at its maximum.
+        :param name: An item name.
+        :param quality: The quality to look for.
+        :return: An ItemView, by ascending sell-in
+        """
+        partition = self._partition(name)
+        if partition is None:
+            return EMPTY_VIEW
+        bucket = partition.quality_buckets().get(quality)
+        return EMPTY_VIEW if bucket is None else ItemView(bucket)
+
+    def update_quality(self):
+        """
+        Update every item by one day, keeping the indexes up to date.
+        :return: None
+        """
+        self.day += 1
+        for handler, partition in self._partitions.items():
+            for item in partition.items:
+                handler.UpdateItem(item)
+            partition.by_quality = None
+            if not partition.shifts:
+                partition.sort(partition.items, self.day)
+
+    def advance(self, days):
+        """
+        Update every item by the given number of days, keeping the indexes up to date.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        self.day += days
+        for handler, partition in self._partitions.items():
+            for item in partition.items:
+                handler.AdvanceItem(item, days)
+            partition.by_quality = None
+            if not partition.shifts:
+                partition.sort(partition.items, self.day)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, GildedRose, Item
+
+CHUNK_SIZE = 100000
+
+
+def pack_chunk(items):
+    """
+    Pack items into a compact, cheap to pickle chunk: a table of the distinct names,
+    and arrays of each item's name position, sell_in and quality. The names themselves
+    are sent because symbol ids differ between processes.
+    :param items: A list of Item objects.
+    :return: A tuple of (names, name_index, sell_in, quality)
+    """
+    positions = {}
+    name_index = array("I", [positions.setdefault(item.symbol, len(positions)) for item in items])
+    sell_in = array("q", [item.sell_in for item in items])
+    quality = array("q", [item.quality for item in items])
+    return [symbol.name for symbol in positions], name_index, sell_in, quality
+
+
+def update_chunk(chunk, days, registry=None):
+    """
+    Update a packed chunk by the given number of days. This runs in the worker processes.
+    :param chunk: A chunk made by pack_chunk.
+    :param days: The number of days to advance.
+    :param registry: The HandlerRegistry to pass to GildedRose.
+    :return: A tuple of the updated (sell_in, quality) arrays
+    """
+    names, name_index, sell_in, quality = chunk
+    items = [Item(names[index], item_sell_in, item_quality)
+             for index, item_sell_in, item_quality in zip(name_index, sell_in, quality)]
+    GildedRose(items, registry).advance(days)
+    return array("q", [item.sell_in for item in items]), array("q", [item.quality for item in items])
+
+
+class ParallelGildedRose(GildedRose):
+
+    def __init__(self, items, workers=None, chunk_size=CHUNK_SIZE, registry=None):
+        """
+        Initialize a GildedRose that updates its items on a pool of worker processes.
+
+        The inventory is split into chunks of chunk_size items, which are packed with
+        pack_chunk, updated in the workers and written back to the original Item
+        objects in their original order. The process pool is started on first use;
+        call close, or use the object as a context manager, to shut it down.
+
+        :param items: A list of Item objects representing the inventory.
+        :param workers: The number of worker processes, defaults to the number of CPUs.
+        :param chunk_size: The number of items sent to a worker at a time.
+        :param registry: The HandlerRegistry that maps item names to handlers. A registry
+            other than the default is pickled and sent with every chunk.
+        :return: None
+        """
+        super().__init__(items, registry)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1, got %s" % chunk_size)
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def update_quality(self):
+        """
+        Update the quality of all items in the inventory by one day, in parallel.
+        :return: None
+        """
+        self.advance(1)
+
+    def advance(self, days):
+        """
+        Update all items in the inventory by the given number of days, in parallel.
+        Inventories of a single chunk are updated in this process.
+        :param days: The number of days to advance, 0 or more.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        if len(self.items) <= self.chunk_size or self.workers == 1:
+            super().advance(days)
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        starts = range(0, len(self.items), self.chunk_size)
+        chunks = (pack_chunk(self.items[start:start + self.chunk_size]) for start in starts)
+        # the workers import the default registry themselves
+        registry = None if self.registry is DEFAULT_REGISTRY else self.registry
+        results = self._executor.map(update_chunk, chunks, [days] * len(starts), [registry] * len(starts))
+        for start, (sell_in, quality) in zip(starts, results):
+            for item, item_sell_in, item_quality in zip(self.items[start:start + self.chunk_size], sell_in, quality):
+                item.sell_in = item_sell_in
+                item.quality = item_quality
+
+    def close(self):
+        """
+        Shut down the worker processes, if they were started.
+        :return: None
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from queue import Queue
+
+from gilded_rose.gilded_rose import GildedRose
+from gilded_rose.parallel import pack_chunk
+from gilded_rose.report import render_chunk
+
+# The most days a pipelined report holds in memory at once
+QUEUE_SIZE = 2
+
+
+def _start_workers(workers):
+    # the pool only starts its processes on the first submit; start them before the
+    # writer thread, since forking while another thread runs can copy a held lock
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        executor.submit(int).result()
+    except BaseException:
+        executor.shutdown()
+        raise
+    return executor
+
+
+def _write_rendered(pending, out, failures):
+    # runs on the writer thread until it gets None; after a failure it keeps taking
+    # days off the queue, so that the updating thread is never blocked
+    while True:
+        render = pending.get()
+        if render is None:
+            return
+        if failures:
+            continue
+        try:
+            out.write(render())
+        except BaseException as error:
+            failures.append(error)
+
+
+def write_report_pipelined(items, days, out=None, gilded_rose=None, workers=1, queue_size=QUEUE_SIZE):
+    """
+    Write the same report as report.write_report, rendering and writing each day while
+    the items are updated for the next day.
+
+    Each day's items are packed into a chunk with parallel.pack_chunk and rendered by
+    a worker process, so rendering runs on another CPU. The rendered days are written
+    in order by a background thread. Days are handed over through a queue of at most
+    queue_size days, so memory stays bounded when rendering or writing is slower than
+    updating. An error while rendering or writing stops the report and is raised here.
+
+    :param items: A list of Item objects.
+    :param days: The number of days to report, starting at day 0.
+    :param out: A text file to write to, defaults to sys.stdout.
+    :param gilded_rose: The GildedRose that updates the items, defaults to GildedRose(items).
+    :param workers: The number of rendering processes. With 0 the days are rendered
+        on the writer thread, which only overlaps the writes with the updates.
+    :param queue_size: The most days waiting to be written at once.
+    :return: None
+    """
+    if queue_size < 1:
+        raise ValueError("queue_size must be at least 1, got %s" % queue_size)
+    out = sys.stdout if out is None else out
+    gilded_rose = GildedRose(items) if gilded_rose is None else gilded_rose
+    executor = _start_workers(workers) if workers else None
+    pending = Queue(maxsize=queue_size)
+    failures = []
+    writer = threading.Thread(target=_write_rendered, args=(pending, out, failures), name="report-writer")
+    writer.start()
+    try:
+        for day in range(days):
+            if failures:
+                break
+            chunk = pack_chunk(items)
+            if executor is None:
+                pending.put(partial(render_chunk, day, chunk))
+            else:
+                pending.put(executor.submit(render_chunk, day, chunk).result)
+            gilded_rose.update_quality()
+    finally:
+        pending.put(None)
+        writer.join()
+        if executor is not None:
+            executor.shutdown()
+    if failures:
+        raise failures[0]
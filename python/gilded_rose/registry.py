@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict
+
+from gilded_rose.symbols import SYMBOLS
+
+# The most resolved names a registry keeps in its handlers cache
+RESOLUTION_CACHE_SIZE = 4096
+
+
+class _Resolutions(OrderedDict):
+    """
+    Cache of item name to handler. Names that are not cached yet are resolved by
+    the registry on first lookup, so a lookup of a known name is a single dict access.
+    Once the cache holds maxsize names, each new name evicts the oldest one, so a
+    stream of distinct names does not grow it without limit.
+    """
+
+    def __init__(self, registry, maxsize=RESOLUTION_CACHE_SIZE):
+        super().__init__()
+        self.registry = registry
+        self.maxsize = maxsize
+
+    def __missing__(self, name):
+        if len(self) >= self.maxsize:
+            # unlike a dict's first key, an OrderedDict's oldest is found in constant time
+            self.popitem(last=False)
+        handler = self[name] = self.registry.match(name)
+        return handler
+
+
+class HandlerRegistry(object):
+
+    def __init__(self, default, exact=None):
+        """
+        Initialize a registry that maps item names to ItemHandler objects.
+
+        Handlers can be registered for exact names, for name prefixes and for
+        predicates on the name. A name is resolved, in order, by its exact entry,
+        by the longest registered prefix it starts with, by the first predicate that
+        accepts it, and otherwise to the default handler. Resolved names are cached in
+        the handlers dict, up to RESOLUTION_CACHE_SIZE of them, so lookup cost does not
+        grow with the number of registered rules. The same results are kept in a list
+        indexed by the ids of interned name symbols, see handler_table.
+
+        :param default: The handler for names that match no rule.
+        :param exact: Optional dict of exact item name to handler to start with.
+        :return: None
+        """
+        self.default = default
+        self._exact = dict(exact or {})
+        self._prefixes = {}
+        self._prefix_lengths = []
+        self._predicates = []
+        self.handlers = _Resolutions(self)
+        self._table = []
+        # the name each entry of the table was resolved for
+        self._table_names = []
+        self._generation = SYMBOLS.generation
+        # held while the table is brought up to date, so that threads updating with the
+        # same registry do not both add the same names
+        self._table_lock = threading.Lock()
+
+    def __getstate__(self):
+        # the caches are rebuilt on demand, and the handler table is indexed by name
+        # ids, which are only valid in this process
+        state = self.__dict__.copy()
+        del state["handlers"]
+        del state["_table_lock"]
+        state["_table"] = []
+        state["_table_names"] = []
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.handlers = _Resolutions(self)
+        self._table_lock = threading.Lock()
+
+    def _clear(self):
+        with self._table_lock:
+            self.handlers.clear()
+            del self._table[:]
+            del self._table_names[:]
+
+    def register_exact(self, name, handler):
+        """
+        Register a handler for items with exactly the given name.
+        :param name: The item name.
+        :param handler: An ItemHandler object.
+        :return: None
+        """
+        self._exact[name] = handler
+        self._clear()
+
+    def register_prefix(self, prefix, handler):
+        """
+        Register a handler for items whose name starts with the given prefix.
+        :param prefix: The start of the item name.
+        :param handler: An ItemHandler object.
+        :return: None
+        """
+        self._prefixes[prefix] = handler
+        # longest first, so the most specific prefix wins
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._prefixes}, reverse=True)
+        self._clear()
+
+    def register_predicate(self, predicate, handler):
+        """
+        Register a handler for items whose name the given predicate accepts.
+        Predicates are tried in the order they were registered, after exact names
+        and prefixes.
+        :param predicate: A function taking a name and returning True or False.
+        :param handler: An ItemHandler object.
+        :return: None
+        """
+        self._predicates.append((predicate, handler))
+        self._clear()
+
+    def match(self, name):
+        """
+        Find the handler for a name by checking the registered rules, without
+        using the cache.
+        :param name: The item name.
+        :return: An ItemHandler object
+        """
+        handler = self._exact.get(name)
+        if handler is not None:
+            return handler
+        # one dict lookup per distinct prefix length, however many prefixes there are
+        for length in self._prefix_lengths:
+            handler = self._prefixes.get(name[:length])
+            if handler is not None:
+                return handler
+        for predicate, handler in self._predicates:
+            if predicate(name):
+                return handler
+        return self.default
+
+    def resolve(self, name):
+        """
+        Return the handler for a name, resolving and caching it on first use.
+        :param name: The item name.
+        :return: An ItemHandler object
+        """
+        return self.handlers[name]
+
+    def handler_table(self):
+        """
+        Return the handlers as a list indexed by symbol id (see Item.symbol), resolving
+        the names interned since the last call. Fetch the table again after new names
+        may have been interned, eg once per update pass. This is safe to call from
+        several threads.
+        :return: A list of ItemHandler objects
+        """
+        table = self._table
+        names = SYMBOLS.names
+        if self._generation == SYMBOLS.generation and len(table) >= len(names):
+            return table
+        with self._table_lock:
+            if self._generation != SYMBOLS.generation:
+                # ids of names no longer in use have been given to other names
+                self._generation = SYMBOLS.generation
+                table_names = self._table_names
+                for symbol_id, name in enumerate(table_names):
+                    if names[symbol_id] != name:
+                        table_names[symbol_id] = names[symbol_id]
+                        table[symbol_id] = self.handlers[names[symbol_id]]
+            if len(table) < len(names):
+                handlers = self.handlers
+                added = names[len(table):]
+                table.extend([handlers[name] for name in added])
+                self._table_names.extend(added)
+        return table
+
+    def is_default(self, name):
+        """
+        Return True if the name resolves to the default handler, eg because no rule matches it.
+        :param name: The item name.
+        :return: bool
+        """
+        return self.handlers[name] is self.default
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+import sys
+
+from gilded_rose.gilded_rose import GildedRose
+
+
+def render_day(day, items):
+    """
+    Render one day of the TextTest report as a single string.
+
+    The text is the same as printing the day header and then each item with print,
+    but it is built with one join instead of one print call per item.
+
+    :param day: The day number.
+    :param items: A list of Item objects.
+    :return: string
+    """
+    parts = ["-------- day %s --------\nname, sellIn, quality\n" % day]
+    parts.extend(["%s, %s, %s\n" % (item.symbol.name, item.sell_in, item.quality) for item in items])
+    parts.append("\n")
+    return "".join(parts)
+
+
+def render_chunk(day, chunk):
+    """
+    Render one day of the TextTest report from a chunk packed by parallel.pack_chunk,
+    with the same text as render_day gives for the packed items. Chunks are copies,
+    so they can be rendered while the items go on being updated, in another thread
+    or process, see gilded_rose.pipeline.
+    :param day: The day number.
+    :param chunk: A tuple of (names, name_index, sell_in, quality).
+    :return: string
+    """
+    names, name_index, sell_in, quality = chunk
+    parts = ["-------- day %s --------\nname, sellIn, quality\n" % day]
+    parts.extend(["%s, %s, %s\n" % (names[index], item_sell_in, item_quality)
+                  for index, item_sell_in, item_quality in zip(name_index, sell_in, quality)])
+    parts.append("\n")
+    return "".join(parts)
+
+
+def write_report(items, days, out=None, gilded_rose=None):
+    """
+    Write the report for the given number of days, updating the items after each day.
+    Each day is written to out with a single write call.
+    :param items: A list of Item objects.
+    :param days: The number of days to report, starting at day 0.
+    :param out: A text file to write to, defaults to sys.stdout.
+    :param gilded_rose: The GildedRose that updates the items, defaults to GildedRose(items).
+    :return: None
+    """
+    out = sys.stdout if out is None else out
+    gilded_rose = GildedRose(items) if gilded_rose is None else gilded_rose
+    for day in range(days):
+        out.write(render_day(day, items))
+        gilded_rose.update_quality()
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+An asyncio front-end that batches concurrent update requests into single update passes,
+and a small line-delimited JSON server on top of it.
+
+Each request to the server is one line of JSON:
+
+    {"items": [["Aged Brie", 2, 0], ...], "days": 1}
+
+and each response is one line of JSON with the updated items in the same order:
+
+    {"items": [["Aged Brie", 1, 1], ...]}
+
+or {"error": "..."} if the request could not be handled. A request line longer than
+LINE_LIMIT bytes is answered with an error and the connection is closed. To run the server:
+
+    python -m gilded_rose.service --port 8765
+"""
+import argparse
+import asyncio
+import json
+
+from gilded_rose.gilded_rose import GildedRose, Item
+
+BATCH_WINDOW = 0.002
+
+MAX_BATCH_ITEMS = 100000
+
+# The longest request or response line, in bytes: about 300000 items
+LINE_LIMIT = 16 * 2 ** 20
+
+
+class InventoryService(object):
+
+    def __init__(self, batch_window=BATCH_WINDOW, max_batch_items=MAX_BATCH_ITEMS, registry=None):
+        """
+        Initialize the service.
+
+        Requests that arrive within batch_window seconds of the first pending request
+        are updated together, in one GildedRose pass over all of their items. A batch
+        is started early once it holds max_batch_items items.
+
+        :param batch_window: How long, in seconds, to wait for more requests to batch.
+        :param max_batch_items: The number of pending items that starts a batch at once.
+        :param registry: The HandlerRegistry to pass to GildedRose.
+        :return: None
+        """
+        self.batch_window = batch_window
+        self.max_batch_items = max_batch_items
+        self.registry = registry
+        self.batches = 0
+        self._pending = []
+        self._pending_items = 0
+        self._timer = None
+
+    async def update(self, items, days=1):
+        """
+        Update one store's items by the given number of days, batched with any other
+        requests that arrive at about the same time. The items are updated in place.
+        :param items: A list of Item objects.
+        :param days: The number of days to advance.
+        :return: The same list of items, once updated
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._pending.append((items, days, done))
+        self._pending_items += len(items)
+        if self._pending_items >= self.max_batch_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._flush)
+        return await done
+
+    async def update_many(self, stores, days=1):
+        """
+        Update several stores' items concurrently, in as few passes as possible.
+        :param stores: A list of lists of Item objects, one per store.
+        :param days: The number of days to advance.
+        :return: A list of the updated item lists, in the order of stores
+        """
+        return await asyncio.gather(*(self.update(items, days) for items in stores))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._pending_items = self._pending, [], 0
+
+        by_days = {}
+        for items, days, done in pending:
+            by_days.setdefault(days, []).append((items, done))
+        for days, requests in by_days.items():
+            batch = [item for items, _ in requests for item in items]
+            try:
+                GildedRose(batch, self.registry).advance(days)
+            except Exception as error:
+                for _, done in requests:
+                    if not done.done():
+                        done.set_exception(error)
+                continue
+            self.batches += 1
+            for items, done in requests:
+                if not done.done():
+                    done.set_result(items)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Serve line-delimited JSON requests on one connection until it is closed.
+        Requests on a connection are answered in order.
+        :param reader: The connection's asyncio.StreamReader.
+        :param writer: The connection's asyncio.StreamWriter.
+        :return: None
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as error:
+                    # the rest of the line may still be arriving, so the next request cannot be found
+                    writer.write(json.dumps({"error": "ValueError: %s" % error}).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    # checked here, so that one bad request cannot fail the batch it joins
+                    items = [Item(str(name), _integer("sell_in", sell_in), _integer("quality", quality))
+                             for name, sell_in, quality in request["items"]]
+                    days = _integer("days", request.get("days", 1))
+                    await self.update(items, days)
+                    response = {"items": [[item.name, item.sell_in, item.quality] for item in items]}
+                except (ValueError, KeyError, TypeError, OverflowError) as error:
+                    response = {"error": "%s: %s" % (type(error).__name__, error)}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+def _integer(field, value):
+    # JSON numbers with a fraction, or out of float range, are not silently rounded
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError("%s must be an integer, got %r" % (field, value))
+    return value
+
+
+async def start_server(service, host="127.0.0.1", port=0, limit=LINE_LIMIT):
+    """
+    Start a TCP server for the service. Port 0 picks a free port; read it from
+    server.sockets[0].getsockname().
+    :param service: An InventoryService.
+    :param host: The address to listen on.
+    :param port: The port to listen on.
+    :param limit: The longest request line accepted, in bytes.
+    :return: An asyncio.Server
+    """
+    return await asyncio.start_server(service.handle_connection, host, port, limit=limit)
+
+
+async def start_unix_server(service, path, limit=LINE_LIMIT):
+    """
+    Start a Unix socket server for the service.
+    :param service: An InventoryService.
+    :param path: The path of the socket.
+    :param limit: The longest request line accepted, in bytes.
+    :return: An asyncio.Server
+    """
+    return await asyncio.start_unix_server(service.handle_connection, path, limit=limit)
+
+
+async def open_connection(host="127.0.0.1", port=8765, limit=LINE_LIMIT):
+    """
+    Connect to a TCP server of the service, for request_update.
+    :param host: The server's address.
+    :param port: The server's port.
+    :param limit: The longest response line accepted, in bytes.
+    :return: A (reader, writer) tuple
+    """
+    return await asyncio.open_connection(host, port, limit=limit)
+
+
+async def open_unix_connection(path, limit=LINE_LIMIT):
+    """
+    Connect to a Unix socket server of the service, for request_update.
+    :param path: The path of the socket.
+    :param limit: The longest response line accepted, in bytes.
+    :return: A (reader, writer) tuple
+    """
+    return await asyncio.open_unix_connection(path, limit=limit)
+
+
+async def request_update(reader, writer, items, days=1):
+    """
+    Send one update request over an open connection and wait for its response. Open
+    the connection with open_connection or open_unix_connection, so that responses for
+    large inventories fit in the reader's line limit.
+    :param reader: The connection's asyncio.StreamReader.
+    :param writer: The connection's asyncio.StreamWriter.
+    :param items: A list of Item objects, updated in place from the response.
+    :param days: The number of days to advance.
+    :return: The same list of items
+    """
+    request = {"items": [[item.name, item.sell_in, item.quality] for item in items], "days": days}
+    writer.write(json.dumps(request).encode("utf-8") + b"\n")
+    await writer.drain()
+    response = json.loads(await reader.readline())
+    if "error" in response:
+        raise ValueError(response["error"])
+    for item, (_, sell_in, quality) in zip(items, response["items"]):
+        item.sell_in = sell_in
+        item.quality = quality
+    return items
+
+
+async def serve(host, port, path=None, batch_window=BATCH_WINDOW):
+    service = InventoryService(batch_window)
+    server = await (start_unix_server(service, path) if path else start_server(service, host, port))
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve batched inventory updates over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW)
+    args = parser.parse_args(argv)
+    asyncio.run(serve(args.host, args.port, args.unix_socket, args.batch_window))
+
+
+if __name__ == "__main__":
+    main()
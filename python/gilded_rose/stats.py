@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import copy
+import json
+import time
+from collections import Counter
+
+
+class UpdateStats(object):
+
+    def __init__(self, on_pass=None):
+        """
+        Initialize an empty set of counters for instrumenting GildedRose updates.
+
+        Pass it as GildedRose(items, stats=stats). Each update_quality or advance call
+        then records, per handler type, the number of items updated and the time spent
+        updating them; the number of items in the pass; the names that fell back to the
+        registry's default handler; and how often quality was clamped at 0 and at 50.
+        A GildedRose without stats does none of this work.
+
+        :param on_pass: Optional function called with this object after every pass.
+        :return: None
+        """
+        self.calls = Counter()
+        self.seconds = Counter()
+        self.pass_item_counts = []
+        self.dispatch_misses = Counter()
+        self.clamp_hits = {0: 0, 50: 0}
+        self.on_pass = on_pass
+        # id of a shared handler -> (handler, copy of it that reports clamp hits here)
+        self._instrumented = {}
+
+    def _instrumented_handler(self, handler):
+        entry = self._instrumented.get(id(handler))
+        if entry is None:
+            instrumented = copy.copy(handler)
+            instrumented.stats = self
+            # keep the original alive so that its id cannot be reused
+            entry = self._instrumented[id(handler)] = (handler, instrumented)
+        return entry[1]
+
+    def record(self, gilded_rose, method, *args):
+        """
+        Update every item of a GildedRose with the given handler method, recording
+        counters and timings. Called by GildedRose.update_quality and GildedRose.advance.
+        :param gilded_rose: The GildedRose being updated.
+        :param method: "UpdateItem" or "AdvanceItem".
+        :param args: Extra arguments for the handler method, eg the number of days.
+        :return: None
+        """
+        registry = gilded_rose.registry
+        handlers = registry.handler_table()
+        calls = self.calls
+        seconds = self.seconds
+        clock = time.perf_counter
+        count = 0
+        for item in gilded_rose.items:
+            handler = handlers[item.symbol.id]
+            if handler is registry.default:
+                self.dispatch_misses[item.name] += 1
+            kind = type(handler).__name__
+            update = getattr(self._instrumented_handler(handler), method)
+            start = clock()
+            update(item, *args)
+            seconds[kind] += clock() - start
+            calls[kind] += 1
+            count += 1
+        self.pass_item_counts.append(count)
+        if self.on_pass is not None:
+            self.on_pass(self)
+
+    def to_dict(self):
+        """
+        Return the counters as plain dicts and lists.
+        :return: dict
+        """
+        return {
+            "calls": dict(self.calls),
+            "seconds": dict(self.seconds),
+            "pass_item_counts": list(self.pass_item_counts),
+            "dispatch_misses": dict(self.dispatch_misses),
+            "clamp_hits": {str(bound): hits for bound, hits in self.clamp_hits.items()},
+        }
+
+    def to_json(self, indent=None):
+        """
+        Return the counters as a JSON string.
+        :param indent: Passed to json.dumps.
+        :return: string
+        """
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
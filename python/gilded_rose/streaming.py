@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Update inventory files that are too large to load into memory.
+
+Records are read, updated and written a chunk at a time, so memory use depends on
+the chunk size and not on the size of the inventory:
+
+    python -m gilded_rose.streaming inventory.csv updated.csv --days 1
+"""
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+
+from gilded_rose.gilded_rose import GildedRose, Item
+
+FIELDS = ["name", "sell_in", "quality"]
+
+CHUNK_SIZE = 10000
+
+
+def read_items(lines, format="csv"):
+    """
+    Read items one at a time from an iterable of text lines, eg an open file.
+
+    "csv" input has a name,sell_in,quality header row. "jsonl" input has one JSON
+    object per line with name, sell_in and quality keys.
+
+    :param lines: An iterable of lines.
+    :param format: "csv" or "jsonl".
+    :return: A generator of Item objects
+    """
+    if format == "csv":
+        reader = csv.reader(lines)
+        header = next(reader, None)
+        if header is not None and header != FIELDS:
+            raise ValueError("expected a %s header, got %s" % (",".join(FIELDS), ",".join(header)))
+        for name, sell_in, quality in reader:
+            yield Item(name, int(sell_in), int(quality))
+    elif format == "jsonl":
+        for line in lines:
+            if line.strip():
+                record = json.loads(line)
+                yield Item(record["name"], record["sell_in"], record["quality"])
+    else:
+        raise ValueError("unknown format %r, expected 'csv' or 'jsonl'" % format)
+
+
+def write_items(items, out, format="csv"):
+    """
+    Write items to a text file in the given format, one record at a time.
+    :param items: An iterable of Item objects.
+    :param out: A text file opened for writing.
+    :param format: "csv" or "jsonl".
+    :return: None
+    """
+    if format == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow(FIELDS)
+        for item in items:
+            writer.writerow((item.name, item.sell_in, item.quality))
+    elif format == "jsonl":
+        for item in items:
+            out.write(json.dumps({"name": item.name, "sell_in": item.sell_in, "quality": item.quality}))
+            out.write("\n")
+    else:
+        raise ValueError("unknown format %r, expected 'csv' or 'jsonl'" % format)
+
+
+def update_items(items, days=1, chunk_size=CHUNK_SIZE, registry=None):
+    """
+    Update a stream of items by the given number of days.
+
+    Items are updated with GildedRose.advance a chunk at a time, so the rules are
+    exactly those of the in-memory GildedRose.
+
+    :param items: An iterable of Item objects.
+    :param days: The number of days to advance.
+    :param chunk_size: The number of items held in memory at once.
+    :param registry: The HandlerRegistry to pass to GildedRose.
+    :return: A generator of the updated Item objects, in input order
+    """
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        GildedRose(chunk, registry).advance(days)
+        yield from chunk
+
+
+def update_stream(source, target, days=1, format="csv", output_format=None, chunk_size=CHUNK_SIZE,
+                  registry=None):
+    """
+    Read items from source, update them by the given number of days and write them
+    to target.
+    :param source: A text file, or iterable of lines, to read from.
+    :param target: A text file to write to.
+    :param days: The number of days to advance.
+    :param format: The format of source, "csv" or "jsonl".
+    :param output_format: The format of target, defaults to the format of source.
+    :param chunk_size: The number of items held in memory at once.
+    :param registry: The HandlerRegistry to pass to GildedRose.
+    :return: None
+    """
+    items = update_items(read_items(source, format), days, chunk_size, registry)
+    write_items(items, target, output_format or format)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="file to read, or - for stdin")
+    parser.add_argument("target", help="file to write, or - for stdout")
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.source == "-" else open(args.source, newline="", encoding="utf-8")
+    target = sys.stdout if args.target == "-" else open(args.target, "w", newline="", encoding="utf-8")
+    try:
+        update_stream(source, target, args.days, args.format, args.output_format, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
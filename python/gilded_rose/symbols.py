@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+import threading
+import weakref
+
+
+class Symbol(object):
+    """
+    An interned item name and its small integer id. Items hold their name's symbol,
+    so items with the same name share one string, and tables keyed by name can be
+    lists indexed by symbol.id.
+    """
+
+    __slots__ = ("id", "name", "__weakref__")
+
+    def __init__(self, symbol_id, name):
+        self.id = symbol_id
+        self.name = name
+
+    def __reduce__(self):
+        # ids are only valid in this process, so unpickle by interning the name again
+        return _intern, (self.name,)
+
+    def __repr__(self):
+        return "Symbol(%s, %r)" % (self.id, self.name)
+
+
+class _Entry(weakref.ref):
+    # the table's weak reference to a symbol, with what is needed to free its id
+    __slots__ = ("name", "symbol_id")
+
+
+class SymbolTable(object):
+
+    def __init__(self):
+        """
+        Initialize an empty table that interns item names as Symbol objects with
+        small integer ids.
+
+        Once nothing holds a name's symbol any more, eg when the last item with that
+        name is gone, its id is freed. A free id keeps its name, so interning that name
+        again brings the same id back, until the id is given to another new name. So
+        the ids stay below the most names in use at one time, however many names pass
+        through, eg while streaming a file of distinct names. Each time an id is given
+        to another name, generation goes up by 1, so that tables indexed by id know to
+        rebuild.
+
+        Ids are only meaningful within one process; pass names, not ids, to other
+        processes and files.
+
+        :return: None
+        """
+        # the name of each id; a free id keeps its last name until it is given to another
+        self.names = []
+        self.generation = 0
+        self._entries = {}
+        # the free ids, as dict keys so that one can be taken back in constant time
+        self._free = {}
+        # reentrant, since a symbol can be freed, and _release called, by the thread holding it
+        self._lock = threading.RLock()
+
+    def intern(self, name):
+        """
+        Return the symbol of a name, adding the name to the table if it is not in use.
+        :param name: The item name.
+        :return: A Symbol
+        """
+        entry = self._entries.get(name)
+        if entry is not None:
+            symbol = entry()
+            if symbol is not None:
+                return symbol
+        # only new names take the lock, so they get one id each even across threads
+        with self._lock:
+            entry = self._entries.get(name)
+            symbol = None if entry is None else entry()
+            if symbol is None:
+                symbol = Symbol(self._take_id(name, entry), name)
+                entry = self._entries[name] = _Entry(symbol, self._release)
+                entry.name = name
+                entry.symbol_id = symbol.id
+        return symbol
+
+    def _take_id(self, name, entry):
+        if entry is not None and entry.symbol_id in self._free:
+            # the name's old id is still free
+            del self._free[entry.symbol_id]
+            return entry.symbol_id
+        if not self._free:
+            self.names.append(name)
+            return len(self.names) - 1
+        symbol_id, _ = self._free.popitem()
+        old_entry = self._entries.get(self.names[symbol_id])
+        if old_entry is not None and old_entry.symbol_id == symbol_id:
+            del self._entries[self.names[symbol_id]]
+        self.names[symbol_id] = name
+        self.generation += 1
+        return symbol_id
+
+    def _release(self, entry):
+        # called once the last reference to a symbol is gone
+        with self._lock:
+            self._free[entry.symbol_id] = None
+
+    def __len__(self):
+        """
+        The number of ids in use or free, ie one more than the highest id.
+        :return: int
+        """
+        return len(self.names)
+
+
+# The table every Item interns its name in
+SYMBOLS = SymbolTable()
+
+
+def _intern(name):
+    return SYMBOLS.intern(name)
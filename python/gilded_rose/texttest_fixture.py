@@ -3,6 +3,7 @@ from __future__ import print_function
 
 # from gilded_rose.gilded_rose import *
 from gilded_rose.gilded_rose import *
+from gilded_rose.report import write_report
 
 def main():
     print("OMGHAI!")
@@ -21,13 +22,7 @@ def main():
     import sys
     if len(sys.argv) > 1:
         days = int(sys.argv[1]) + 1
-    for day in range(days):
-        print("-------- day %s --------" % day)
-        print("name, sellIn, quality")
-        for item in items:
-            print(item)
-        print("")
-        GildedRose(items).update_quality()
+    write_report(items, days)
 
 
 if __name__ == "__main__":
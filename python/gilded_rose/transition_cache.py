@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, Item
+
+POLICIES = ("lru", "fifo")
+
+
+class TransitionCache(object):
+
+    def __init__(self, maxsize=4096, policy="lru"):
+        """
+        Initialize a bounded cache of item state transitions.
+
+        The update rules are pure functions of (handler, sell_in, quality, days), so
+        the resulting (sell_in, quality) can be computed once and reused for every item
+        in the same state. When the cache is full the oldest entry is evicted: with the
+        "lru" policy an entry counts as new again each time it is used, with "fifo" only
+        when it is added.
+
+        :param maxsize: The most transitions to keep, or None for no limit.
+        :param policy: The eviction policy, "lru" or "fifo".
+        :return: None
+        """
+        if policy not in POLICIES:
+            raise ValueError("unknown eviction policy %r, expected one of %s" % (policy, ", ".join(POLICIES)))
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1 or None, got %s" % maxsize)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def hit_rate(self):
+        """
+        The share of lookups answered from the cache, between 0 and 1.
+        :return: float
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def transition(self, handler, sell_in, quality, days):
+        """
+        Return the state an item reaches from the given state after the given number
+        of days, computing it with handler.AdvanceItem on a cache miss.
+        :param handler: The item's ItemHandler.
+        :param sell_in: The item's sell-in.
+        :param quality: The item's quality.
+        :param days: The number of days to advance.
+        :return: A tuple of (sell_in, quality)
+        """
+        key = (handler, sell_in, quality, days)
+        entries = self._entries
+        result = entries.get(key)
+        if result is not None:
+            self.hits += 1
+            if self.policy == "lru":
+                entries.move_to_end(key)
+            return result
+
+        self.misses += 1
+        scratch = Item("", sell_in, quality)
+        handler.AdvanceItem(scratch, days)
+        result = entries[key] = (scratch.sell_in, scratch.quality)
+        if self.maxsize is not None and len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def advance(self, items, days, registry=DEFAULT_REGISTRY):
+        """
+        Update items by the given number of days, computing each distinct
+        (handler, sell_in, quality) state once and copying the result to every
+        item in that state.
+        :param items: A list of Item objects.
+        :param days: The number of days to advance, 0 or more.
+        :param registry: The HandlerRegistry that maps item names to handlers.
+        :return: None
+        """
+        if days < 0:
+            raise ValueError("days must not be negative, got %s" % days)
+        handlers = registry.handler_table()
+        states = {}
+        for item in items:
+            key = (handlers[item.symbol.id], item.sell_in, item.quality)
+            group = states.get(key)
+            if group is None:
+                states[key] = [item]
+            else:
+                group.append(item)
+
+        for (handler, sell_in, quality), group in states.items():
+            new_sell_in, new_quality = self.transition(handler, sell_in, quality, days)
+            for item in group:
+                item.sell_in = new_sell_in
+                item.quality = new_quality
+
+    def clear(self):
+        """
+        Empty the cache and reset its counters.
+        :return: None
+        """
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = 0
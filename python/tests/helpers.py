@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Inventories and comparisons shared by the test modules.
+"""
+import random
+
+from gilded_rose.gilded_rose import Item
+
+# One name for each kind of item in the requirements
+NAMES = [
+    "+5 Dexterity Vest",
+    "Conjured",
+    "Aged Brie",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Sulfuras, Hand of Ragnaros",
+]
+
+
+def grid_items(sell_ins, qualities, names=NAMES):
+    """
+    Build one item for every name and every (sell_in, quality) pair.
+    :param sell_ins: The sell_in values, eg a range.
+    :param qualities: The quality values.
+    :param names: The item names.
+    :return: A list of Item objects
+    """
+    return [Item(name, sell_in, quality) for name in names for sell_in in sell_ins for quality in qualities]
+
+
+def random_items(seed, count, sell_ins, qualities, names=NAMES):
+    """
+    Build random items, the same ones for the same arguments.
+    :param seed: The seed for random.Random.
+    :param count: The number of items.
+    :param sell_ins: The lowest and highest sell_in, inclusive.
+    :param qualities: The lowest and highest quality, inclusive.
+    :param names: The names to choose from.
+    :return: A list of Item objects
+    """
+    generator = random.Random(seed)
+    return [Item(generator.choice(names), generator.randint(*sell_ins), generator.randint(*qualities))
+            for _ in range(count)]
+
+
+def as_tuples(items):
+    """
+    :param items: An iterable of Item objects.
+    :return: A list of (name, sell_in, quality) tuples, to compare items by value
+    """
+    return [(item.name, item.sell_in, item.quality) for item in items]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.run_benchmarks import compare, main
+
+
+class BenchmarkSuiteTest(unittest.TestCase):
+
+    def test_compare_reports_only_regressions_over_threshold(self):
+        baseline = {"update_quality[1000]": 1.0, "dispatch[1000]": 1.0, "formatting[1000]": 1.0}
+        results = {"update_quality[1000]": 1.05, "dispatch[1000]": 1.5, "formatting[1000]": 0.5, "new[1000]": 9.0}
+
+        regressions = compare(results, baseline, threshold=10)
+
+        self.assertEqual(["dispatch[1000]"], [key for key, _, _, _ in regressions])
+
+    def test_run_saves_and_compares_results(self):
+        folder = tempfile.mkdtemp()
+        try:
+            path = os.path.join(folder, "results.json")
+            arguments = ["--benchmarks", "update_quality", "formatting", "--sizes", "100", "--repeat", "1"]
+
+            self.assertEqual(0, main(arguments + ["--save", path]))
+            with open(path) as source:
+                saved = json.load(source)
+            self.assertEqual({"update_quality[100]", "formatting[100]"}, set(saved["results"]))
+
+            saved["results"] = {key: seconds / 1000 for key, seconds in saved["results"].items()}
+            with open(path, "w") as out:
+                json.dump(saved, out)
+            self.assertEqual(1, main(arguments + ["--compare", path]))
+        finally:
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
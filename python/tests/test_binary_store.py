@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from gilded_rose.gilded_rose import Item, GildedRose
+from gilded_rose.binary_store import MappedInventory, read_inventory, write_inventory
+from tests.helpers import NAMES, as_tuples, grid_items
+
+def make_items():
+    return grid_items(range(-2, 14), (-1, 0, 1, 25, 49, 50, 80), NAMES + ["Épée of the Mongoose"])
+
+
+class BinaryStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "inventory.bin")
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_round_trip_preserves_items(self):
+        items = make_items()
+        write_inventory(self.path, items)
+
+        self.assertEqual(as_tuples(items), as_tuples(read_inventory(self.path)))
+
+    def test_update_in_place_matches_gilded_rose(self):
+        """
+        Updates made through the mapped file are written to the file itself and give
+        the same items as the GildedRose object path.
+        """
+        items = make_items()
+        write_inventory(self.path, items)
+        size = os.path.getsize(self.path)
+
+        with MappedInventory(self.path) as inventory:
+            inventory.update_quality()
+            inventory.advance(12)
+        GildedRose(items).update_quality()
+        GildedRose(items).advance(12)
+
+        self.assertEqual(size, os.path.getsize(self.path))
+        self.assertEqual(as_tuples(items), as_tuples(read_inventory(self.path)))
+
+    def test_read_only_inventory_cannot_be_updated(self):
+        write_inventory(self.path, make_items())
+
+        with MappedInventory(self.path, writable=False) as inventory:
+            with self.assertRaises(ValueError):
+                inventory.update_quality()
+
+    def test_empty_inventory(self):
+        write_inventory(self.path, [])
+
+        with MappedInventory(self.path) as inventory:
+            inventory.update_quality()
+            self.assertEqual(0, len(inventory))
+        self.assertEqual([], read_inventory(self.path))
+
+    def test_values_outside_32_bits_are_rejected(self):
+        with self.assertRaises(ValueError):
+            write_inventory(self.path, [Item("anything", 2 ** 31, 0)])
+
+    def test_update_that_leaves_32_bits_is_rejected(self):
+        sell_in = -2 ** 31 + 3
+        write_inventory(self.path, [Item("Backstage passes to a TAFKAL80ETC concert", sell_in, 10)])
+
+        with MappedInventory(self.path) as inventory:
+            with self.assertRaises(ValueError):
+                inventory.advance(10)
+            with self.assertRaises(ValueError):
+                inventory.advance(2 ** 40)
+
+        self.assertEqual([("Backstage passes to a TAFKAL80ETC concert", sell_in, 10)],
+                         [(item.name, item.sell_in, item.quality) for item in read_inventory(self.path)])
+
+    def test_blocks_are_updated_like_gilded_rose(self):
+        items = make_items() + [Item("Aged Brie", 3, 2 ** 31 - 1), Item("Conjured", 2 ** 31 - 1, 2 ** 31 - 1)]
+        expected = make_items() + [Item("Aged Brie", 3, 2 ** 31 - 1), Item("Conjured", 2 ** 31 - 1, 2 ** 31 - 1)]
+        write_inventory(self.path, items)
+
+        with mock.patch("gilded_rose.binary_store.BLOCK_SIZE", 7):
+            with MappedInventory(self.path) as inventory:
+                inventory.update_quality()
+                inventory.advance(2 ** 31 - 10)
+        GildedRose(expected).update_quality()
+        GildedRose(expected).advance(2 ** 31 - 10)
+
+        self.assertEqual(as_tuples(expected), as_tuples(read_inventory(self.path)))
+
+    def test_update_rejected_in_a_later_block_leaves_every_block_unchanged(self):
+        items = make_items() + [Item("+5 Dexterity Vest", -2 ** 31, 10)]
+        write_inventory(self.path, items)
+
+        with mock.patch("gilded_rose.binary_store.BLOCK_SIZE", 7):
+            with MappedInventory(self.path) as inventory:
+                with self.assertRaises(ValueError):
+                    inventory.update_quality()
+
+        self.assertEqual(as_tuples(items), as_tuples(read_inventory(self.path)))
+
+    def test_sulfuras_can_advance_any_number_of_days(self):
+        write_inventory(self.path, [Item("Sulfuras, Hand of Ragnaros", -2 ** 31, 80)])
+
+        with MappedInventory(self.path) as inventory:
+            inventory.advance(2 ** 40)
+
+        self.assertEqual([(0, 80)], [(item.sell_in, item.quality) for item in read_inventory(self.path)])
+
+    def test_other_files_are_rejected(self):
+        with open(self.path, "wb") as out:
+            out.write(b"name,sell_in,quality\n" * 2)
+
+        with self.assertRaises(ValueError):
+            MappedInventory(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from gilded_rose.gilded_rose import GildedRose, Item
+from gilded_rose.changelog import (EXPIRED, HIT_MAX, HIT_ZERO, ItemChange, apply_changes, read_changes,
+                                   update_with_changes, write_changes)
+from tests.helpers import as_tuples
+
+
+def make_items():
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=0, quality=1),
+        Item(name="Aged Brie", sell_in=2, quality=49),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=0, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=0, quality=10),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+    ]
+
+
+class ChangelogTest(unittest.TestCase):
+
+    def test_changes_and_events(self):
+        changes = list(update_with_changes(GildedRose(make_items())))
+
+        self.assertEqual([
+            ItemChange(0, 0, -1, 1, 0, EXPIRED | HIT_ZERO),
+            ItemChange(1, 2, 1, 49, 50, HIT_MAX),
+            ItemChange(3, 0, -1, 10, 0, EXPIRED | HIT_ZERO),
+            ItemChange(4, -1, 0, 80, 80, 0),
+        ], changes)
+        self.assertEqual(["expired", "hit 0"], changes[0].event_names)
+
+    def test_unchanged_items_are_skipped(self):
+        gilded_rose = GildedRose([Item("Sulfuras, Hand of Ragnaros", 0, 80)])
+
+        self.assertEqual([], list(update_with_changes(gilded_rose)))
+
+    def test_update_matches_gilded_rose(self):
+        for days in (1, 3, 12):
+            items = make_items()
+            expected = make_items()
+
+            list(update_with_changes(GildedRose(items), days))
+            GildedRose(expected).advance(days)
+
+            self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    def test_binary_round_trip_replicates_inventory(self):
+        """
+        A replica that applies the binary changelog ends up with the same items.
+        """
+        items = make_items()
+        replica = make_items()
+        gilded_rose = GildedRose(items)
+
+        for _ in range(15):
+            out = io.BytesIO()
+            written = write_changes(update_with_changes(gilded_rose), out)
+            changes = list(read_changes(io.BytesIO(out.getvalue())))
+            self.assertEqual(written, len(changes))
+            apply_changes(replica, changes)
+
+        self.assertEqual(as_tuples(items), as_tuples(replica))
+
+    def test_negative_days_are_rejected_on_call(self):
+        with self.assertRaises(ValueError):
+            update_with_changes(GildedRose(make_items()), -1)
+
+    def test_truncated_record_is_rejected(self):
+        out = io.BytesIO()
+        write_changes([ItemChange(0, 1, 0, 5, 4, 0)], out)
+
+        with self.assertRaises(ValueError):
+            list(read_changes(io.BytesIO(out.getvalue()[:-1])))
+
+
+if __name__ == '__main__':
+    unittest.main()
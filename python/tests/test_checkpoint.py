@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from gilded_rose.gilded_rose import Item
+from gilded_rose.checkpoint import CheckpointedSimulation
+from gilded_rose.report import write_report
+
+
+def make_items():
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=10, quality=20),
+        Item(name="Aged Brie", sell_in=2, quality=0),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=15, quality=20),
+        Item(name="Conjured Mana Cake", sell_in=3, quality=6),
+    ]
+
+
+class CrashingOutput(io.StringIO):
+    """
+    Output that fails once a given number of days has been written, to simulate a crash.
+    Set days again to go on writing to it.
+    """
+
+    def __init__(self, days):
+        super().__init__()
+        self.days = days
+
+    def write(self, text):
+        if self.days == 0:
+            raise RuntimeError("crash")
+        self.days -= 1
+        return super().write(text)
+
+
+class Terminal(io.StringIO):
+    """
+    Output that cannot be truncated, like sys.stdout.
+    """
+
+    def seekable(self):
+        return False
+
+
+def report_days(text):
+    return ["-------- day" + day for day in text.split("-------- day")[1:]]
+
+
+class CheckpointedSimulationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_run_matches_report(self):
+        expected = io.StringIO()
+        write_report(make_items(), 31, expected)
+
+        out = io.StringIO()
+        CheckpointedSimulation(self.folder, every=7).run(make_items(), 31, out)
+
+        self.assertEqual(expected.getvalue(), out.getvalue())
+
+    def test_resume_after_crash_continues_identically(self):
+        """
+        After a crash on day 17, resuming from the day 14 checkpoint drops days 14 to 16
+        from the report and writes days 14 to 30, so the report is exactly that of an
+        uninterrupted run.
+        """
+        expected = io.StringIO()
+        write_report(make_items(), 31, expected)
+
+        simulation = CheckpointedSimulation(self.folder, every=7)
+        report = CrashingOutput(17)
+        with self.assertRaises(RuntimeError):
+            simulation.run(make_items(), 31, report)
+        self.assertEqual(report_days(expected.getvalue())[:17], report_days(report.getvalue()))
+
+        report.days = 31
+        CheckpointedSimulation(self.folder, every=7).resume(make_items(), 31, report)
+
+        self.assertEqual(expected.getvalue(), report.getvalue())
+
+    def test_resume_truncates_report_file(self):
+        expected = io.StringIO()
+        write_report(make_items(), 20, expected)
+        path = os.path.join(self.folder, "report.txt")
+        simulation = CheckpointedSimulation(os.path.join(self.folder, "checkpoints"), every=5)
+        with open(path, "w") as report:
+            simulation.run(make_items(), 12, report)
+
+        with open(path, "r+") as report:
+            simulation.resume(make_items(), 20, report)
+
+        with open(path) as report:
+            self.assertEqual(expected.getvalue(), report.read())
+
+    def test_resume_to_unseekable_output_starts_at_checkpoint_day(self):
+        """
+        Output that cannot be truncated gets the report from the checkpoint's day on;
+        the caller drops the days from there on that the crashed run wrote.
+        """
+        expected = io.StringIO()
+        write_report(make_items(), 31, expected)
+        expected_days = report_days(expected.getvalue())
+        simulation = CheckpointedSimulation(self.folder, every=7)
+        crashed = Terminal()
+        simulation.run(make_items(), 17, crashed)
+        self.assertEqual([7, 14], [day for day, _ in simulation.checkpoints()])
+
+        resumed = Terminal()
+        simulation.resume(make_items(), 31, resumed)
+
+        self.assertEqual(expected_days[14:], report_days(resumed.getvalue()))
+
+    def test_resume_to_other_report_is_rejected(self):
+        simulation = CheckpointedSimulation(self.folder, every=7)
+        simulation.run(make_items(), 17, io.StringIO())
+
+        with self.assertRaises(ValueError):
+            simulation.resume(make_items(), 31, io.StringIO())
+
+    def test_resume_without_checkpoint_starts_from_day_0(self):
+        expected = io.StringIO()
+        write_report(make_items(), 5, expected)
+
+        out = io.StringIO()
+        CheckpointedSimulation(self.folder).resume(make_items(), 5, out)
+
+        self.assertEqual(expected.getvalue(), out.getvalue())
+
+    def test_only_newest_checkpoints_are_kept(self):
+        simulation = CheckpointedSimulation(self.folder, every=2, keep=2)
+        simulation.run(make_items(), 10, io.StringIO())
+
+        self.assertEqual([8, 10], [day for day, _ in simulation.checkpoints()])
+        self.assertEqual(["day-000000008-at-1585.bin", "day-000000010-at-1981.bin"], sorted(os.listdir(self.folder)))
+
+    def test_partial_checkpoint_is_ignored(self):
+        simulation = CheckpointedSimulation(self.folder, every=3)
+        simulation.run(make_items(), 4, io.StringIO())
+        with open(os.path.join(self.folder, "day-000000006.bin.tmp"), "wb") as partial:
+            partial.write(b"GRINV")
+
+        day, items, _ = simulation.load()
+
+        self.assertEqual(3, day)
+        self.assertEqual(5, len(items))
+
+    def test_partial_checkpoints_are_removed_by_next_run(self):
+        partial = os.path.join(self.folder, "day-000000006.bin.tmp")
+        with open(partial, "wb") as out:
+            out.write(b"GRINV")
+
+        CheckpointedSimulation(self.folder, every=3).run(make_items(), 4, io.StringIO())
+
+        self.assertFalse(os.path.exists(partial))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose.gilded_rose import Item, GildedRose, ITEM_HANDLERS, NORMAL_ITEM_HANDLER, BackstagePassesItemHandler
+from gilded_rose.columnar import ColumnarInventory
+from gilded_rose.registry import HandlerRegistry
+from tests import helpers
+from tests.helpers import as_tuples, grid_items
+
+NAMES = helpers.NAMES + ["Conjured Mana Cake"]
+
+
+def make_items():
+    """
+    Build one item for every name and every (sell_in, quality) pair in a range
+    that covers both clamps and every sell_in threshold, including values outside
+    the usual 0..50 range.
+    """
+    return grid_items(range(-3, 16), (-2, 0, 1, 2, 3, 4, 10, 47, 48, 49, 50, 51, 80), NAMES)
+
+
+class ColumnarInventoryTest(unittest.TestCase):
+
+    def test_round_trip_preserves_items(self):
+        items = make_items()
+
+        inventory = ColumnarInventory.from_items(items)
+
+        self.assertEqual(len(items), len(inventory))
+        self.assertEqual(as_tuples(items), as_tuples(inventory.to_items()))
+
+    def test_update_quality_matches_item_handlers(self):
+        """
+        Run the handler based GildedRose and the columnar inventory side by side
+        for 20 days and check that every item is identical after every day.
+        """
+        items = make_items()
+        inventory = ColumnarInventory.from_items(items)
+        gilded_rose = GildedRose(items)
+
+        for day in range(20):
+            gilded_rose.update_quality()
+            inventory.update_quality()
+            self.assertEqual(as_tuples(items), as_tuples(inventory.to_items()), "day %s" % day)
+
+    def test_advance_matches_item_handlers(self):
+        for days in (0, 1, 3, 6, 11, 16, 40):
+            items = make_items()
+            inventory = ColumnarInventory.from_items(items)
+
+            GildedRose(items).advance(days)
+            inventory.advance(days)
+
+            self.assertEqual(as_tuples(items), as_tuples(inventory.to_items()), "days %s" % days)
+
+    def test_custom_backstage_tiers_match_item_handlers(self):
+        registry = HandlerRegistry(NORMAL_ITEM_HANDLER, exact=ITEM_HANDLERS)
+        registry.register_exact("Festival pass", BackstagePassesItemHandler((-2, 3, 8, 20), (0, 5, 4, 0, 1)))
+        registry.register_exact("Flat pass", BackstagePassesItemHandler((), (2,)))
+        registry.register_exact("Same as default", BackstagePassesItemHandler())
+        names = NAMES + ["Festival pass", "Flat pass", "Same as default"]
+
+        for days in (1, 3, 9, 25):
+            items = [Item(name, sell_in, quality) for name in names
+                     for sell_in in range(-3, 25) for quality in (0, 1, 30, 49, 50, 51)]
+            inventory = ColumnarInventory.from_items(items, registry)
+            self.assertEqual(3, len(inventory.tiers))
+
+            stepped = ColumnarInventory.from_items(items, registry)
+            for _ in range(days):
+                stepped.update_quality()
+            GildedRose(items, registry).advance(days)
+            inventory.advance(days)
+
+            self.assertEqual(as_tuples(items), as_tuples(inventory.to_items()), "days %s" % days)
+            self.assertEqual(as_tuples(items), as_tuples(stepped.to_items()), "days %s" % days)
+
+    def test_empty_inventory(self):
+        inventory = ColumnarInventory.from_items([])
+        inventory.update_quality()
+
+        self.assertEqual([], inventory.to_items())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from gilded_rose.binary_store import INT32_MAX, INT32_MIN
+from gilded_rose.differential import (ENGINES, QUALITY_BOUNDARIES, REGISTRIES, SELL_IN_BOUNDARIES, UNSUPPORTED,
+                                      Case, Counterexample, case_at, check, run, run_advance, run_engine, shrink)
+
+
+def capped_brie(case):
+    """
+    An engine with a bug: Aged Brie never gets above 49.
+    """
+    return [(name, sell_in, min(quality, 49) if name == "Aged Brie" else quality)
+            for name, sell_in, quality in run_advance(case)]
+
+
+def default_registry_only(case):
+    """
+    An engine with a bug: it ignores the case's registry.
+    """
+    return run_advance(case._replace(registry="default"))
+
+
+def raising_on_conjured(case):
+    if any(name == "Conjured" for name, _, _ in case.items):
+        raise RuntimeError("no conjured items")
+    return run_advance(case)
+
+
+class DifferentialTest(unittest.TestCase):
+
+    def test_every_engine_matches_reference(self):
+        self.assertEqual([], run(150, seed=7, workers=1, batch_size=50))
+
+    def test_worker_processes_check_cases(self):
+        self.assertEqual([], run(20, seed=8, workers=2, engines=["advance", "columnar_advance"], batch_size=10))
+
+    def test_worker_processes_check_every_engine(self):
+        self.assertEqual([], run(20, seed=9, workers=2, batch_size=10))
+
+    def test_cases_are_reproducible(self):
+        self.assertEqual(case_at(3, 41), case_at(3, 41))
+        self.assertNotEqual(case_at(3, 41), case_at(3, 42))
+
+    def test_cases_vary_registry_and_boundary_values(self):
+        cases = [case_at(3, index) for index in range(300)]
+        sell_ins = {sell_in for case in cases for _, sell_in, _ in case.items}
+        qualities = {quality for case in cases for _, _, quality in case.items}
+
+        self.assertEqual(set(REGISTRIES), {case.registry for case in cases})
+        self.assertEqual(set(SELL_IN_BOUNDARIES), sell_ins & set(SELL_IN_BOUNDARIES))
+        self.assertEqual(set(QUALITY_BOUNDARIES), qualities & set(QUALITY_BOUNDARIES))
+
+    def test_engines_use_the_case_registry(self):
+        # more items than ParallelGildedRose's chunks, so that they go to its worker processes
+        case = Case((("Festival pass", 21, 5), ("Flat pass", 4, 5), ("Conjured Cheese", 3, 10),
+                     ("Thunderfury (legendary)", 2, 80), ("Backstage passes to Iron Maiden", 11, 20)), 25, "tiers")
+        for engine in ENGINES:
+            if engine != "binary_store":
+                with self.subTest(engine=engine):
+                    self.assertIsNone(check(engine, case))
+
+    def test_values_at_32_bit_limits_match_reference(self):
+        case = Case((("+5 Dexterity Vest", INT32_MIN + 3, INT32_MAX), ("Aged Brie", INT32_MAX, INT32_MIN),
+                     ("Festival pass", INT32_MAX, 5), ("Sulfuras, Hand of Ragnaros", INT32_MIN, INT32_MAX)), 2, "tiers")
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                self.assertIsNone(check(engine, case))
+
+    def test_unsupported_case_is_not_a_failure(self):
+        beyond_32_bits = Case((("+5 Dexterity Vest", INT32_MIN, 5),), 1)
+        custom_tiers = Case((("Festival pass", 10, 5),), 1, "tiers")
+
+        self.assertEqual(UNSUPPORTED, run_engine("binary_store", beyond_32_bits))
+        self.assertEqual(UNSUPPORTED, run_engine("checkpoint", beyond_32_bits))
+        self.assertEqual(UNSUPPORTED, run_engine("changelog", beyond_32_bits))
+        self.assertEqual(UNSUPPORTED, run_engine("binary_store", custom_tiers))
+        self.assertIsNone(check("binary_store", custom_tiers))
+
+    def test_counterexample_is_shrunk(self):
+        with mock.patch.dict(ENGINES, {"capped_brie": capped_brie}):
+            counterexamples = run(200, seed=1, workers=1, engines=["capped_brie", "advance"])
+
+        self.assertEqual(1, len(counterexamples))
+        self.assertEqual("capped_brie", counterexamples[0].engine)
+        self.assertEqual(Case((("Aged Brie", 0, 50),), 0), counterexamples[0].case)
+        self.assertIn("capped_brie differs after 0 days with the default registry", str(counterexamples[0]))
+
+    def test_counterexample_keeps_the_registry_it_needs(self):
+        with mock.patch.dict(ENGINES, {"default_registry_only": default_registry_only}):
+            counterexamples = run(200, seed=1, workers=1, engines=["default_registry_only"])
+
+        self.assertEqual(1, len(counterexamples))
+        self.assertEqual(Case((("Thunderfury (legendary)", 0, 0),), 1, "rules"), counterexamples[0].case)
+
+    def test_exception_is_a_counterexample(self):
+        case = Case((("Aged Brie", 5, 5), ("Conjured", 30, 40)), 12)
+        with mock.patch.dict(ENGINES, {"raising": raising_on_conjured}):
+            counterexample = shrink(check("raising", case))
+
+        self.assertEqual(Counterexample("raising", Case((("Conjured", 0, 0),), 0), [("Conjured", 0, 0)],
+                                        "RuntimeError: no conjured items"), counterexample)
+
+    def test_unknown_engine_is_rejected(self):
+        with self.assertRaises(ValueError):
+            run(1, engines=["fastest"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+import pickle
+import random
+import sys
 import unittest
 
 # from gilded_rose import Item, GildedRose
-from gilded_rose.gilded_rose import Item, GildedRose
+from gilded_rose.gilded_rose import (Item, GildedRose, ITEM_HANDLERS, NORMAL_ITEM_HANDLER, BackstagePassesItemHandler,
+                                     NormalItemHandler, SulfurasItemHandler)
+from gilded_rose.registry import HandlerRegistry
+from gilded_rose.symbols import SYMBOLS
 
 class GildedRoseTest(unittest.TestCase):
 
@@ -239,9 +245,172 @@ class GildedRoseTest(unittest.TestCase):
         
         self.assertEqual(items[0].quality, 0, "test_Conjured_quality_never_less_than_0 quality should be 0 when sell_in is 0 or under")
 
+    def test_get_ItemHandler_shares_handler_between_items_is_successful(self):
+        """
+        Test that items of the same type are updated by one shared handler, and that
+        renaming an item changes the handler it is dispatched to.
+        """
+        first = Item(name="Aged Brie", sell_in=5, quality=10)
+        second = Item(name="Aged Brie", sell_in=2, quality=3)
+        gilded_rose = GildedRose([first, second])
+
+        self.assertIs(gilded_rose.get_ItemHandler(first), gilded_rose.get_ItemHandler(second))
+
+        second.name = "Sulfuras, Hand of Ragnaros"
+        self.assertIsInstance(gilded_rose.get_ItemHandler(second), SulfurasItemHandler)
+        self.assertIsInstance(gilded_rose.get_ItemHandler(Item("anything", 0, 0)), NormalItemHandler)
+
+
+    def test_item_has_no_instance_dict_is_successful(self):
+        """
+        Test that Item keeps its attributes in slots rather than a per-instance dict,
+        and that its repr is unchanged.
+        """
+        item = Item(name="Aged Brie", sell_in=2, quality=0)
+
+        self.assertFalse(hasattr(item, "__dict__"))
+        self.assertEqual("Aged Brie, 2, 0", repr(item))
+        with self.assertRaises(AttributeError):
+            item.colour = "blue"
+
+
+    def test_items_share_interned_names_is_successful(self):
+        """
+        Test that items built from equal but separate name strings share one name
+        string and name id.
+        """
+        first = Item("".join(["Aged ", "Brie"]), 1, 1)
+        second = Item("".join(["Aged", " Brie"]), 1, 1)
+
+        self.assertEqual(first.name_id, second.name_id)
+        self.assertIs(first.name, second.name)
+
+    def test_unused_name_id_is_reused_is_successful(self):
+        """
+        Test that once no item has a name, its id is given to the next new name.
+        """
+        item = Item("Only used once", 1, 1)
+        name_id = item.name_id
+        del item
+
+        other = Item("Used instead", 1, 1)
+
+        self.assertEqual(name_id, other.name_id)
+        self.assertEqual("Used instead", other.name)
+
+    def test_name_used_again_keeps_its_id_is_successful(self):
+        item = Item("Used now and then", 1, 1)
+        name_id = item.name_id
+        generation = SYMBOLS.generation
+        del item
+
+        again = Item("Used now and then", 1, 1)
+
+        self.assertEqual(name_id, again.name_id)
+        self.assertEqual(generation, SYMBOLS.generation)
+
+    def test_renamed_item_uses_new_handler_is_successful(self):
+        item = Item("Aged Brie", 5, 10)
+        gilded_rose = GildedRose([item])
+        gilded_rose.update_quality()
+
+        item.name = "Conjured"
+        gilded_rose.update_quality()
+
+        self.assertEqual("Conjured, 3, 9", repr(item))
+
+    def test_pickled_item_keeps_name_is_successful(self):
+        item = pickle.loads(pickle.dumps(Item("Sulfuras, Hand of Ragnaros", 0, 80)))
+
+        self.assertEqual("Sulfuras, Hand of Ragnaros, 0, 80", repr(item))
+        self.assertIsInstance(GildedRose([item]).get_ItemHandler(item), SulfurasItemHandler)
+
+
+HANDLER_NAMES = [
+    "anything",
+    "Conjured",
+    "Aged Brie",
+    "Backstage passes to a TAFKAL80ETC concert",
+    "Sulfuras, Hand of Ragnaros",
+]
+
+
+class GildedRoseAdvanceTest(unittest.TestCase):
+
+    def assert_advance_matches_update_quality(self, name, sell_in, quality, days, registry=None):
+        stepped = Item(name, sell_in, quality)
+        gilded_rose = GildedRose([stepped], registry)
+        for _ in range(days):
+            gilded_rose.update_quality()
+
+        advanced = Item(name, sell_in, quality)
+        GildedRose([advanced], registry).advance(days)
+
+        self.assertEqual((stepped.sell_in, stepped.quality), (advanced.sell_in, advanced.quality),
+                         "advance(%s) of %r" % (days, Item(name, sell_in, quality)))
+
+    def test_advance_matches_repeated_update_quality_for_random_items(self):
+        """
+        Property test: for random items of every handler type, including quality values
+        outside 0..50, advance(days) gives the same result as calling update_quality
+        that many times.
+        """
+        generator = random.Random(20240601)
+        for name in HANDLER_NAMES:
+            for _ in range(500):
+                self.assert_advance_matches_update_quality(
+                    name, generator.randint(-20, 40), generator.randint(-5, 90), generator.randint(0, 60))
+
+    def test_advance_matches_repeated_update_quality_at_thresholds(self):
+        for name in HANDLER_NAMES:
+            for sell_in in (-1, 0, 1, 5, 6, 10, 11, 12):
+                for quality in (0, 1, 49, 50):
+                    for days in (0, 1, 2, 6, 11, 12):
+                        self.assert_advance_matches_update_quality(name, sell_in, quality, days)
+
+    def test_advance_matches_repeated_update_quality_for_custom_tiers(self):
+        registry = HandlerRegistry(NORMAL_ITEM_HANDLER, exact=ITEM_HANDLERS)
+        registry.register_exact("Festival pass", BackstagePassesItemHandler((-2, 3, 8, 20), (0, 5, 4, 0, 1)))
+        registry.register_exact("Flat pass", BackstagePassesItemHandler((), (2,)))
+        generator = random.Random(20240602)
+        for name in ("Festival pass", "Flat pass"):
+            for _ in range(500):
+                self.assert_advance_matches_update_quality(
+                    name, generator.randint(-5, 30), generator.randint(-5, 60), generator.randint(0, 30), registry)
+
+    def test_default_backstage_tiers_match_original_rules(self):
+        def original_rules(sell_in, quality):
+            if sell_in > 0:
+                if sell_in < 6:
+                    quality = min(quality + 3, 50)
+                elif sell_in < 11:
+                    quality = min(quality + 2, 50)
+                else:
+                    quality = min(quality + 1, 50)
+            if sell_in <= 0:
+                quality = 0
+            return sell_in - 1, quality
+
+        handler = BackstagePassesItemHandler()
+        for sell_in in range(-3, 20):
+            for quality in (0, 1, 47, 48, 49, 50, 51):
+                item = Item("pass", sell_in, quality)
+                handler.UpdateItem(item)
+                self.assertEqual(original_rules(sell_in, quality), (item.sell_in, item.quality))
+
+    def test_invalid_backstage_tiers_are_rejected(self):
+        for thresholds, increments in (((11, 6), (3, 2, 1)), ((6, 6), (3, 2, 1)), ((6, 11), (3, 2)), ((6,), (3, -1))):
+            with self.assertRaises(ValueError):
+                BackstagePassesItemHandler(thresholds, increments)
+
+    def test_advance_negative_days_is_rejected(self):
+        with self.assertRaises(ValueError):
+            GildedRose([Item("anything", 1, 1)]).advance(-1)
+
 
 if __name__ == '__main__':
-    suite = unittest.defaultTestLoader.loadTestsFromTestCase(GildedRoseTest)
+    # every test case class in this file, including the advance property tests
+    suite = unittest.defaultTestLoader.loadTestsFromModule(sys.modules[__name__])
     runner = unittest.TextTestRunner()
     result = runner.run(suite)
 
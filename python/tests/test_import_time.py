@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import unittest
+
+PYTHON_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous enough for a slow CI machine, small enough to catch a heavy import
+IMPORT_BUDGET_MICROSECONDS = 50000
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter with -X importtime and return the
+    cumulative import time, in microseconds, of every module that was loaded.
+    :param module: The dotted name of the module to import.
+    :return: A dict of module name to cumulative microseconds
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import %s" % module],
+                            cwd=PYTHON_FOLDER, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    def test_gilded_rose_imports_no_heavy_modules(self):
+        """
+        The gilded_rose module is imported by short-lived workers, so besides modules
+        loaded when the interpreter starts it should only need small standard library
+        ones, like threading, weakref, bisect and collections, and none of these.
+        """
+        times = import_times("gilded_rose.gilded_rose")
+
+        for heavy in ("tkinter", "_tkinter", "select", "numpy"):
+            self.assertNotIn(heavy, times)
+
+    def test_gilded_rose_import_is_within_budget(self):
+        times = import_times("gilded_rose.gilded_rose")
+
+        self.assertLess(times["gilded_rose.gilded_rose"], IMPORT_BUDGET_MICROSECONDS)
+
+    def test_report_imports_no_process_pool(self):
+        """
+        The TextTest fixture imports the report module, so the process pool of the
+        pipelined report stays in gilded_rose.pipeline.
+        """
+        times = import_times("gilded_rose.report")
+
+        for heavy in ("concurrent.futures", "multiprocessing", "queue"):
+            self.assertNotIn(heavy, times)
+
+
+if __name__ == '__main__':
+    unittest.main()
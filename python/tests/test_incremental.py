@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, GildedRose, Item
+from gilded_rose.incremental import IncrementalGildedRose
+from tests.helpers import as_tuples, random_items
+
+def make_items(seed=7, count=400):
+    return random_items(seed, count, (-5, 20), (-2, 80))
+
+
+class IncrementalGildedRoseTest(unittest.TestCase):
+
+    def test_update_quality_matches_gilded_rose(self):
+        items = make_items()
+        expected = make_items()
+        incremental = IncrementalGildedRose(items)
+        reference = GildedRose(expected)
+
+        for day in range(40):
+            incremental.update_quality()
+            reference.update_quality()
+            # reading only every few days checks that settled items catch up when read
+            if day % 7 == 0 or day == 39:
+                self.assertEqual(as_tuples(expected), as_tuples(incremental.items), "day %s" % day)
+
+    def test_advance_matches_gilded_rose(self):
+        items = make_items()
+        expected = make_items()
+        incremental = IncrementalGildedRose(items)
+        reference = GildedRose(expected)
+
+        for days in (3, 0, 1, 12, 30):
+            incremental.advance(days)
+            reference.advance(days)
+            self.assertEqual(as_tuples(expected), as_tuples(incremental.items), "%s days" % days)
+
+    def test_settled_items_leave_the_daily_update(self):
+        incremental = IncrementalGildedRose([
+            Item("+5 Dexterity Vest", 10, 2),
+            Item("Aged Brie", 10, 49),
+            Item("Sulfuras, Hand of Ragnaros", 0, 80),
+            Item("Backstage passes to a TAFKAL80ETC concert", 1, 10),
+        ])
+        self.assertEqual(3, incremental.active_count)
+
+        incremental.update_quality()
+        self.assertEqual(2, incremental.active_count)
+        incremental.update_quality()
+        self.assertEqual(0, incremental.active_count)
+
+        incremental.advance(100)
+        self.assertEqual([("+5 Dexterity Vest", -92, 0),
+                          ("Aged Brie", -92, 50),
+                          ("Sulfuras, Hand of Ragnaros", 0, 80),
+                          ("Backstage passes to a TAFKAL80ETC concert", -101, 0)],
+                         as_tuples(incremental.items))
+
+    def test_rebucket_picks_up_outside_changes(self):
+        item = Item("+5 Dexterity Vest", 5, 0)
+        incremental = IncrementalGildedRose([item])
+        self.assertEqual(0, incremental.active_count)
+
+        item.quality = 10
+        incremental.rebucket()
+        incremental.update_quality()
+
+        self.assertEqual((4, 9), (item.sell_in, item.quality))
+
+    def test_rebucket_keeps_outside_sell_in_changes(self):
+        incremental = IncrementalGildedRose([Item("Aged Brie", 5, 50), Item("+5 Dexterity Vest", 5, 0)])
+        incremental.advance(2)
+
+        brie, vest = incremental.items
+        brie.sell_in = 30
+        vest.sell_in, vest.quality = 20, 10
+        incremental.rebucket()
+        incremental.update_quality()
+
+        self.assertEqual([("Aged Brie", 29, 50), ("+5 Dexterity Vest", 19, 9)], as_tuples(incremental.items))
+
+    def test_settled_items_only_move_by_sell_in_step(self):
+        """
+        Property test: once a handler reports an item as settled, advancing it any
+        number of days only changes its sell-in, by sell_in_step per day.
+        """
+        for item in make_items(seed=11, count=2000):
+            handler = DEFAULT_REGISTRY.resolve(item.name)
+            if not handler.is_settled(item):
+                continue
+            sell_in, quality = item.sell_in, item.quality
+            GildedRose([item]).advance(9)
+            self.assertEqual((sell_in + 9 * handler.sell_in_step, quality), (item.sell_in, item.quality))
+
+
+if __name__ == '__main__':
+    unittest.main()
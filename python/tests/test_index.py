@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose.gilded_rose import GildedRose, Item
+from gilded_rose.index import IndexedGildedRose
+from tests import helpers
+from tests.helpers import as_tuples, random_items
+
+BRIE = "Aged Brie"
+PASSES = "Backstage passes to a TAFKAL80ETC concert"
+SULFURAS = "Sulfuras, Hand of Ragnaros"
+NAMES = helpers.NAMES + ["Elixir of the Mongoose"]
+
+
+def make_items(seed=5, count=2000):
+    return random_items(seed, count, (-5, 20), (0, 50), NAMES)
+
+
+def sorted_tuples(items):
+    return sorted(as_tuples(items))
+
+
+class IndexedGildedRoseTest(unittest.TestCase):
+
+    def assertQueriesMatchScan(self, gilded_rose):
+        items = gilded_rose.items
+        for name in NAMES:
+            self.assertEqual(sorted_tuples(item for item in items if item.name == name),
+                             sorted_tuples(item for item in gilded_rose.category(name) if item.name == name))
+            for lowest, highest in ((None, 5), (6, 10), (0, None), (3, 3), (None, None)):
+                expected = [item for item in items if item.name == name
+                            and (lowest is None or item.sell_in >= lowest)
+                            and (highest is None or item.sell_in <= highest)]
+                view = gilded_rose.sell_in_between(name, lowest, highest)
+                self.assertEqual(sorted_tuples(expected), sorted_tuples(item for item in view if item.name == name))
+            for quality in (0, 50, 80):
+                expected = [item for item in items if item.name == name and item.quality == quality]
+                view = gilded_rose.with_quality(name, quality)
+                self.assertEqual(sorted_tuples(expected), sorted_tuples(item for item in view if item.name == name))
+
+    def test_queries_match_scan_as_days_pass(self):
+        indexed = IndexedGildedRose(make_items())
+        expected = make_items()
+
+        for days in (0, 1, 1, 4, 1, 12):
+            if days == 1:
+                indexed.update_quality()
+            else:
+                indexed.advance(days)
+            GildedRose(expected).advance(days)
+            self.assertEqual([(item.name, item.sell_in, item.quality) for item in expected],
+                             [(item.name, item.sell_in, item.quality) for item in indexed.items])
+            self.assertQueriesMatchScan(indexed)
+
+    def test_sell_in_view_is_sorted_and_not_copied(self):
+        items = [Item(PASSES, sell_in, 10) for sell_in in (12, 3, 8, 5, 1)]
+        indexed = IndexedGildedRose(items)
+        indexed.update_quality()
+
+        view = indexed.sell_in_between(PASSES, highest=5)
+
+        self.assertEqual([0, 2, 4], [item.sell_in for item in view])
+        self.assertIs(items[1], view[1])
+        self.assertEqual([2, 4], [item.sell_in for item in view[1:]])
+        self.assertEqual(3, len(view))
+
+    def test_sulfuras_is_sorted_again_after_update(self):
+        indexed = IndexedGildedRose([Item(SULFURAS, 5, 80), Item(SULFURAS, -1, 80)])
+
+        self.assertEqual(1, len(indexed.sell_in_between(SULFURAS, lowest=5)))
+        indexed.update_quality()
+
+        self.assertEqual(0, len(indexed.sell_in_between(SULFURAS, lowest=5)))
+        self.assertEqual(2, len(indexed.sell_in_between(SULFURAS, 0, 0)))
+
+    def test_missing_category_is_empty(self):
+        indexed = IndexedGildedRose([Item(BRIE, 1, 1)])
+
+        self.assertEqual(0, len(indexed.category(PASSES)))
+        self.assertEqual(0, len(indexed.with_quality(BRIE, 50)))
+
+    def test_reindex_after_outside_change(self):
+        brie = Item(BRIE, 1, 49)
+        indexed = IndexedGildedRose([brie])
+        brie.sell_in = 20
+        indexed.reindex()
+
+        indexed.update_quality()
+
+        self.assertEqual([brie], list(indexed.with_quality(BRIE, 50)))
+        self.assertEqual([brie], list(indexed.sell_in_between(BRIE, lowest=19)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import pickle
+import unittest
+
+from gilded_rose.gilded_rose import GildedRose
+from gilded_rose.parallel import ParallelGildedRose, pack_chunk, update_chunk
+from tests.helpers import as_tuples, grid_items
+
+def make_items():
+    return grid_items(range(-2, 14), (0, 1, 25, 49, 50))
+
+
+class ParallelGildedRoseTest(unittest.TestCase):
+
+    def test_update_chunk_matches_gilded_rose(self):
+        items = make_items()
+        chunk = pickle.loads(pickle.dumps(pack_chunk(items)))
+
+        sell_in, quality = update_chunk(chunk, 3)
+        GildedRose(items).advance(3)
+
+        self.assertEqual([item.sell_in for item in items], list(sell_in))
+        self.assertEqual([item.quality for item in items], list(quality))
+
+    def test_parallel_update_matches_gilded_rose(self):
+        """
+        Items updated in chunks across worker processes end up in the same order and
+        state as items updated by GildedRose, and are the same Item objects.
+        """
+        items = make_items()
+        expected = make_items()
+        reference = GildedRose(expected)
+
+        with ParallelGildedRose(items, workers=2, chunk_size=37) as gilded_rose:
+            originals = list(items)
+            for _ in range(3):
+                gilded_rose.update_quality()
+                reference.update_quality()
+            gilded_rose.advance(10)
+            reference.advance(10)
+
+        self.assertEqual(as_tuples(expected), as_tuples(items))
+        self.assertTrue(all(item is original for item, original in zip(items, originals)))
+
+    def test_small_inventory_is_updated_in_process(self):
+        items = make_items()
+        expected = make_items()
+
+        gilded_rose = ParallelGildedRose(items, chunk_size=len(items))
+        gilded_rose.update_quality()
+        GildedRose(expected).update_quality()
+
+        self.assertIsNone(gilded_rose._executor)
+        self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    def test_invalid_chunk_size_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ParallelGildedRose([], chunk_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
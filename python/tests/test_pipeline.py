@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import io
+import multiprocessing.process
+import threading
+import unittest
+from unittest import mock
+
+from gilded_rose.gilded_rose import GildedRose
+from gilded_rose.pipeline import write_report_pipelined
+from tests.test_report import make_items, print_report
+
+
+class CountingGildedRose(GildedRose):
+
+    def __init__(self, items):
+        super().__init__(items)
+        self.updates = 0
+
+    def update_quality(self):
+        self.updates += 1
+        super().update_quality()
+
+
+class FailingOutput(object):
+    def write(self, text):
+        raise OSError("disk full")
+
+
+class PipelinedReportTest(unittest.TestCase):
+
+    def test_pipelined_report_matches_printed_report(self):
+        for workers in (0, 1):
+            out = io.StringIO()
+            write_report_pipelined(make_items(), 31, out, workers=workers)
+
+            self.assertEqual(print_report(make_items(), 31), out.getvalue(), "workers %s" % workers)
+
+    def test_write_failure_stops_updates(self):
+        gilded_rose = CountingGildedRose(make_items())
+
+        with self.assertRaises(OSError):
+            write_report_pipelined(gilded_rose.items, 1000, FailingOutput(), gilded_rose, workers=0, queue_size=1)
+
+        # the update loop is at most a full queue and the day being handed over ahead
+        self.assertLess(gilded_rose.updates, 4)
+
+    def test_workers_are_started_before_writer_thread(self):
+        """
+        The worker processes are forked before the writer thread is running.
+        """
+        started = []
+        start_process = multiprocessing.process.BaseProcess.start
+        start_thread = threading.Thread.start
+
+        def record_process(process):
+            started.append("process")
+            start_process(process)
+
+        def record_thread(thread):
+            started.append(thread.name)
+            start_thread(thread)
+
+        with mock.patch.object(multiprocessing.process.BaseProcess, "start", record_process), \
+                mock.patch.object(threading.Thread, "start", record_thread):
+            write_report_pipelined(make_items(), 2, io.StringIO(), workers=1)
+
+        self.assertIn("process", started)
+        self.assertLess(started.index("process"), started.index("report-writer"))
+
+    def test_queue_must_be_bounded(self):
+        with self.assertRaises(ValueError):
+            write_report_pipelined(make_items(), 1, io.StringIO(), queue_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+import pickle
+import threading
+import time
+import unittest
+
+from gilded_rose.gilded_rose import (AgedBrieItemHandler, ConjuredItemHandler, DEFAULT_REGISTRY, GildedRose, Item,
+                                     NormalItemHandler, SulfurasItemHandler)
+from gilded_rose.registry import RESOLUTION_CACHE_SIZE, HandlerRegistry
+from gilded_rose.symbols import SYMBOLS
+from gilded_rose.columnar import CONJURED, ColumnarInventory, category_of
+
+NORMAL = NormalItemHandler()
+CONJURED_HANDLER = ConjuredItemHandler()
+BRIE = AgedBrieItemHandler()
+SULFURAS = SulfurasItemHandler()
+
+
+def is_legendary(name):
+    return name.endswith("(legendary)")
+
+
+def is_slow_to_match(name):
+    # gives the other threads a chance to run in the middle of building the handler table
+    time.sleep(0.0001)
+    return False
+
+
+def make_registry():
+    registry = HandlerRegistry(NORMAL)
+    registry.register_exact("Aged Brie", BRIE)
+    registry.register_prefix("Conjured", CONJURED_HANDLER)
+    registry.register_prefix("Aged", SULFURAS)
+    registry.register_predicate(is_legendary, SULFURAS)
+    return registry
+
+
+class HandlerRegistryTest(unittest.TestCase):
+
+    def test_rules_are_matched_in_order(self):
+        registry = make_registry()
+
+        self.assertIs(BRIE, registry.resolve("Aged Brie"))
+        self.assertIs(SULFURAS, registry.resolve("Aged Gouda"))
+        self.assertIs(CONJURED_HANDLER, registry.resolve("Conjured Mana Cake"))
+        self.assertIs(CONJURED_HANDLER, registry.resolve("Conjured"))
+        self.assertIs(SULFURAS, registry.resolve("Thunderfury (legendary)"))
+        self.assertIs(NORMAL, registry.resolve("+5 Dexterity Vest"))
+        self.assertTrue(registry.is_default("+5 Dexterity Vest"))
+        self.assertFalse(registry.is_default("Conjured Mana Cake"))
+
+    def test_longest_prefix_wins(self):
+        registry = make_registry()
+        registry.register_prefix("Conjured Mana", BRIE)
+
+        self.assertIs(BRIE, registry.resolve("Conjured Mana Cake"))
+        self.assertIs(CONJURED_HANDLER, registry.resolve("Conjured Bread"))
+
+    def test_registering_clears_cached_resolutions(self):
+        registry = make_registry()
+        self.assertIs(NORMAL, registry.resolve("Elixir of the Mongoose"))
+
+        registry.register_exact("Elixir of the Mongoose", BRIE)
+
+        self.assertIs(BRIE, registry.resolve("Elixir of the Mongoose"))
+
+    def test_resolutions_are_cached(self):
+        calls = []
+
+        def predicate(name):
+            calls.append(name)
+            return False
+
+        registry = HandlerRegistry(NORMAL)
+        registry.register_predicate(predicate, BRIE)
+        for _ in range(3):
+            registry.resolve("anything")
+
+        self.assertEqual(["anything"], calls)
+
+    def test_resolution_cache_is_bounded(self):
+        registry = make_registry()
+        for number in range(RESOLUTION_CACHE_SIZE + 100):
+            registry.resolve("Conjured %s" % number)
+
+        self.assertEqual(RESOLUTION_CACHE_SIZE, len(registry.handlers))
+        self.assertNotIn("Conjured 0", registry.handlers)
+        self.assertIs(CONJURED_HANDLER, registry.resolve("Conjured 0"))
+
+    def test_hundreds_of_prefixes(self):
+        registry = HandlerRegistry(NORMAL)
+        for number in range(500):
+            registry.register_prefix("Category %03d " % number, BRIE)
+
+        self.assertIs(BRIE, registry.resolve("Category 250 potion"))
+        self.assertIs(NORMAL, registry.resolve("Category 999 potion"))
+        # every prefix has the same length, so only one prefix length is checked
+        self.assertEqual([len("Category 000 ")], registry._prefix_lengths)
+
+    def test_registry_can_be_pickled(self):
+        original = make_registry()
+        original.resolve("Conjured Mana Cake")
+        self.assertNotIn(b"Conjured Mana Cake", pickle.dumps(original))
+
+        registry = pickle.loads(pickle.dumps(original))
+
+        self.assertIsInstance(registry.resolve("Conjured Mana Cake"), ConjuredItemHandler)
+        self.assertIsInstance(registry.resolve("Thunderfury (legendary)"), SulfurasItemHandler)
+
+    def test_handler_table_is_indexed_by_name_id(self):
+        registry = make_registry()
+        item = Item("Aged Gouda", 1, 1)
+        self.assertIs(SULFURAS, registry.handler_table()[item.name_id])
+
+        registry.register_exact("Aged Gouda", BRIE)
+        later = Item("Thunderfury (legendary)", 1, 1)
+
+        table = registry.handler_table()
+        self.assertIs(BRIE, table[item.name_id])
+        self.assertIs(SULFURAS, table[later.name_id])
+
+    def test_handler_table_follows_reused_ids(self):
+        registry = make_registry()
+        item = Item("Conjured Stew", 1, 1)
+        name_id = item.name_id
+        self.assertIs(CONJURED_HANDLER, registry.handler_table()[name_id])
+        del item
+
+        other = Item("Doomhammer (legendary)", 1, 1)
+
+        self.assertEqual(name_id, other.name_id)
+        self.assertIs(SULFURAS, registry.handler_table()[name_id])
+
+    def test_handler_table_is_safe_across_threads(self):
+        registry = make_registry()
+        registry.register_predicate(is_slow_to_match, NORMAL)
+        items = [Item("Threaded %s%s" % (i, " (legendary)" if i % 2 else ""), 1, 1) for i in range(100)]
+        barrier = threading.Barrier(4)
+        tables = []
+
+        def build():
+            barrier.wait()
+            tables.append(registry.handler_table())
+
+        threads = [threading.Thread(target=build) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(SYMBOLS), len(registry._table))
+        for table in tables:
+            self.assertEqual([SULFURAS if i % 2 else NORMAL for i in range(100)],
+                             [table[item.name_id] for item in items])
+
+    def test_pickled_registry_rebuilds_handler_table(self):
+        registry = make_registry()
+        registry.handler_table()
+
+        copy = pickle.loads(pickle.dumps(registry))
+
+        item = Item("Conjured Bread", 1, 1)
+        self.assertEqual([], copy._table)
+        self.assertIsInstance(copy.handler_table()[item.name_id], ConjuredItemHandler)
+
+    def test_default_registry_keeps_exact_names(self):
+        self.assertIsInstance(DEFAULT_REGISTRY.resolve("Conjured"), ConjuredItemHandler)
+        self.assertIsInstance(DEFAULT_REGISTRY.resolve("Conjured Mana Cake"), NormalItemHandler)
+
+    def test_gilded_rose_uses_registry(self):
+        items = [Item("Conjured Mana Cake", 3, 6), Item("Thunderfury (legendary)", 10, 3)]
+
+        GildedRose(items, make_registry()).update_quality()
+
+        self.assertEqual((2, 4), (items[0].sell_in, items[0].quality))
+        self.assertEqual((0, 80), (items[1].sell_in, items[1].quality))
+
+    def test_columnar_inventory_uses_registry(self):
+        registry = make_registry()
+        items = [Item("Conjured Mana Cake", 3, 6), Item("Aged Gouda", 10, 3)]
+        inventory = ColumnarInventory.from_items(items, registry)
+
+        inventory.update_quality()
+        GildedRose(items, registry).update_quality()
+
+        self.assertEqual(CONJURED, category_of("Conjured Mana Cake", registry))
+        self.assertEqual([(item.name, item.sell_in, item.quality) for item in items],
+                         [(item.name, item.sell_in, item.quality) for item in inventory.to_items()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from gilded_rose.gilded_rose import GildedRose, Item
+from gilded_rose.parallel import pack_chunk
+from gilded_rose.report import render_chunk, render_day, write_report
+
+
+def make_items():
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=10, quality=20),
+        Item(name="Aged Brie", sell_in=2, quality=0),
+        Item(name="Elixir of the Mongoose", sell_in=5, quality=7),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=0, quality=80),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=15, quality=20),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=10, quality=49),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=5, quality=49),
+        Item(name="Conjured Mana Cake", sell_in=3, quality=6),
+    ]
+
+
+def print_report(items, days):
+    """
+    The report as the TextTest fixture used to print it, one print call per line.
+    """
+    out = io.StringIO()
+    for day in range(days):
+        print("-------- day %s --------" % day, file=out)
+        print("name, sellIn, quality", file=out)
+        for item in items:
+            print(item, file=out)
+        print("", file=out)
+        GildedRose(items).update_quality()
+    return out.getvalue()
+
+
+class ReportTest(unittest.TestCase):
+
+    def test_write_report_matches_printed_report(self):
+        out = io.StringIO()
+        write_report(make_items(), 31, out)
+
+        self.assertEqual(print_report(make_items(), 31), out.getvalue())
+
+    def test_render_day_without_items(self):
+        self.assertEqual("-------- day 3 --------\nname, sellIn, quality\n\n", render_day(3, []))
+
+    def test_write_report_writes_each_day_once(self):
+        writes = []
+
+        class Recorder(object):
+            def write(self, text):
+                writes.append(text)
+
+        write_report(make_items(), 4, Recorder())
+
+        self.assertEqual(4, len(writes))
+
+    def test_render_chunk_matches_render_day(self):
+        items = make_items()
+
+        self.assertEqual(render_day(4, items), render_chunk(4, pack_chunk(items)))
+
+
+if __name__ == '__main__':
+    unittest.main()
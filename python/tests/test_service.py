@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from gilded_rose.gilded_rose import GildedRose, Item
+from gilded_rose.service import (InventoryService, open_connection, open_unix_connection, request_update,
+                                 start_server, start_unix_server)
+from tests.helpers import as_tuples
+
+
+def make_store(offset):
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=10 - offset, quality=20),
+        Item(name="Aged Brie", sell_in=2, quality=offset),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=offset, quality=49),
+    ]
+
+
+def expected_store(offset, days=1):
+    items = make_store(offset)
+    GildedRose(items).advance(days)
+    return as_tuples(items)
+
+
+class InventoryServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_requests_share_one_pass(self):
+        service = InventoryService(batch_window=0.01)
+
+        stores = await service.update_many([make_store(offset) for offset in range(10)])
+
+        self.assertEqual(1, service.batches)
+        self.assertEqual([expected_store(offset) for offset in range(10)], [as_tuples(store) for store in stores])
+
+    async def test_requests_for_different_days_are_batched_separately(self):
+        service = InventoryService(batch_window=0.01)
+
+        one, five = await asyncio.gather(service.update(make_store(1)), service.update(make_store(2), days=5))
+
+        self.assertEqual(2, service.batches)
+        self.assertEqual(expected_store(1), as_tuples(one))
+        self.assertEqual(expected_store(2, 5), as_tuples(five))
+
+    async def test_full_batch_is_started_without_waiting(self):
+        service = InventoryService(batch_window=60, max_batch_items=8)
+
+        stores = await asyncio.wait_for(service.update_many([make_store(1), make_store(2)]), timeout=5)
+
+        self.assertEqual([expected_store(1), expected_store(2)], [as_tuples(store) for store in stores])
+
+    async def test_tcp_server_round_trip(self):
+        service = InventoryService(batch_window=0.01)
+        server = await start_server(service)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            connections = [await open_connection(host, port) for _ in range(5)]
+            stores = await asyncio.gather(*(request_update(reader, writer, make_store(offset), 3)
+                                            for offset, (reader, writer) in enumerate(connections)))
+            with self.assertRaises(ValueError):
+                await request_update(*connections[0], [Item("anything", 1, 1)], days=-1)
+            for _, writer in connections:
+                writer.close()
+                await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual([expected_store(offset, 3) for offset in range(5)], [as_tuples(store) for store in stores])
+        self.assertEqual(1, service.batches)
+
+    @unittest.skipIf(sys.platform == "win32", "Unix sockets only")
+    async def test_unix_server_round_trip(self):
+        folder = tempfile.mkdtemp()
+        path = os.path.join(folder, "gilded_rose.sock")
+        server = await start_unix_server(InventoryService(), path)
+        try:
+            reader, writer = await open_unix_connection(path)
+            store = await request_update(reader, writer, make_store(4))
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+            shutil.rmtree(folder)
+
+        self.assertEqual(expected_store(4), as_tuples(store))
+
+    async def test_large_request_round_trip(self):
+        # far more than asyncio's default line limit of 64 KiB
+        stores = [make_store(offset % 20) for offset in range(1000)]
+        server = await start_server(InventoryService())
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await open_connection(host, port)
+            store = await request_update(reader, writer, [item for items in stores for item in items])
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual([item for offset in range(1000) for item in expected_store(offset % 20)], as_tuples(store))
+
+    async def test_too_long_request_gets_an_error(self):
+        server = await start_server(InventoryService(), limit=1024)
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await open_connection(host, port)
+            with self.assertRaises(ValueError):
+                await request_update(reader, writer, make_store(1) * 100)
+            self.assertEqual(b"", await reader.read())
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    async def test_days_must_be_a_whole_number(self):
+        server = await start_server(InventoryService())
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await open_connection(host, port)
+            for days in (1.5, "1", True, None):
+                with self.assertRaises(ValueError):
+                    await request_update(reader, writer, [Item("Aged Brie", 2, 0)], days)
+            store = await request_update(reader, writer, [Item("Aged Brie", 2, 0)], 2)
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual([("Aged Brie", 0, 2)], as_tuples(store))
+
+    async def test_item_values_must_be_whole_numbers(self):
+        server = await start_server(InventoryService())
+        host, port = server.sockets[0].getsockname()[:2]
+        try:
+            reader, writer = await open_connection(host, port)
+            responses = []
+            for values in ("1e400, 3", "2.7, 3", "2, 3.5", '"2", 3', "true, 3", "2, null"):
+                writer.write(b'{"items": [["Aged Brie", %s]]}\n' % values.encode("utf-8"))
+                responses.append(json.loads(await reader.readline()))
+            store = await request_update(reader, writer, [Item("Aged Brie", 2, 0)])
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.assertEqual(["TypeError"] * 6, [response["error"].split(":")[0] for response in responses])
+        self.assertEqual([("Aged Brie", 1, 1)], as_tuples(store))
+
+
+if __name__ == '__main__':
+    unittest.main()
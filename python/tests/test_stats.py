@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, GildedRose, Item
+from gilded_rose.stats import UpdateStats
+from tests.helpers import as_tuples
+
+
+def make_items():
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=10, quality=0),
+        Item(name="Elixir of the Mongoose", sell_in=5, quality=7),
+        Item(name="Aged Brie", sell_in=2, quality=50),
+        Item(name="Conjured", sell_in=0, quality=3),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=0, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=5, quality=49),
+    ]
+
+
+class UpdateStatsTest(unittest.TestCase):
+
+    def test_counters_after_update_quality(self):
+        stats = UpdateStats()
+        gilded_rose = GildedRose(make_items(), stats=stats)
+
+        gilded_rose.update_quality()
+        gilded_rose.update_quality()
+
+        self.assertEqual({"NormalItemHandler": 4, "AgedBrieItemHandler": 2, "ConjuredItemHandler": 2,
+                          "SulfurasItemHandler": 2, "BackstagePassesItemHandler": 2}, dict(stats.calls))
+        self.assertEqual(set(stats.calls), set(stats.seconds))
+        self.assertEqual([6, 6], stats.pass_item_counts)
+        self.assertEqual({"+5 Dexterity Vest": 2, "Elixir of the Mongoose": 2}, dict(stats.dispatch_misses))
+        # vest and conjured are clamped at 0 on both days, brie and passes at 50
+        self.assertEqual({0: 4, 50: 4}, stats.clamp_hits)
+
+    def test_instrumented_update_gives_same_items(self):
+        items = make_items()
+        expected = make_items()
+
+        for days in (1, 4):
+            GildedRose(items, stats=UpdateStats()).advance(days)
+            GildedRose(expected).advance(days)
+
+        self.assertEqual(as_tuples(expected), as_tuples(items))
+
+    def test_shared_handlers_are_not_changed(self):
+        GildedRose(make_items(), stats=UpdateStats()).update_quality()
+
+        self.assertIsNone(DEFAULT_REGISTRY.resolve("Aged Brie").stats)
+
+    def test_on_pass_callback_and_json_export(self):
+        passes = []
+        stats = UpdateStats(on_pass=lambda stats: passes.append(list(stats.pass_item_counts)))
+
+        GildedRose(make_items(), stats=stats).update_quality()
+        exported = json.loads(stats.to_json())
+
+        self.assertEqual([[6]], passes)
+        self.assertEqual({"0": 2, "50": 2}, exported["clamp_hits"])
+        self.assertEqual(2, exported["calls"]["NormalItemHandler"])
+        self.assertEqual([6], exported["pass_item_counts"])
+
+
+if __name__ == '__main__':
+    unittest.main()
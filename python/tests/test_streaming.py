@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import io
+import unittest
+
+from gilded_rose.gilded_rose import Item, GildedRose
+from gilded_rose.streaming import read_items, write_items, update_items, update_stream
+from gilded_rose.symbols import SYMBOLS
+
+
+def make_items():
+    return [
+        Item(name="+5 Dexterity Vest", sell_in=10, quality=20),
+        Item(name="Aged Brie", sell_in=2, quality=0),
+        Item(name="Sulfuras, Hand of Ragnaros", sell_in=-1, quality=80),
+        Item(name="Backstage passes to a TAFKAL80ETC concert", sell_in=10, quality=49),
+        Item(name='Conjured "Mana" Cake', sell_in=3, quality=6),
+        Item(name="Conjured", sell_in=0, quality=30),
+    ]
+
+
+def write(items, format):
+    out = io.StringIO()
+    write_items(items, out, format)
+    return out.getvalue()
+
+
+class StreamingTest(unittest.TestCase):
+
+    def test_csv_round_trip(self):
+        text = write(make_items(), "csv")
+
+        self.assertTrue(text.startswith("name,sell_in,quality\n"))
+        self.assertEqual(text, write(read_items(io.StringIO(text), "csv"), "csv"))
+
+    def test_jsonl_round_trip(self):
+        text = write(make_items(), "jsonl")
+
+        self.assertEqual(len(make_items()), len(text.splitlines()))
+        self.assertEqual(text, write(read_items(io.StringIO(text), "jsonl"), "jsonl"))
+
+    def test_update_stream_matches_in_memory_update(self):
+        """
+        Streaming a file through update_stream in small chunks gives the same output
+        as updating the whole inventory in memory.
+        """
+        for format in ("csv", "jsonl"):
+            for days in (1, 5, 20):
+                items = make_items()
+                GildedRose(items).advance(days)
+                expected = write(items, format)
+
+                target = io.StringIO()
+                update_stream(io.StringIO(write(make_items(), format)), target, days, format, chunk_size=4)
+
+                self.assertEqual(expected, target.getvalue(), "%s, %s days" % (format, days))
+
+    def test_update_stream_converts_format(self):
+        target = io.StringIO()
+        update_stream(io.StringIO(write(make_items(), "csv")), target, format="csv", output_format="jsonl")
+
+        items = make_items()
+        GildedRose(items).update_quality()
+        self.assertEqual(write(items, "jsonl"), target.getvalue())
+
+    def test_update_items_is_lazy(self):
+        """
+        update_items only reads as many items as it needs for the next chunk.
+        """
+        read = []
+
+        def source():
+            for item in make_items():
+                read.append(item)
+                yield item
+
+        updated = update_items(source(), chunk_size=2)
+        next(updated)
+
+        self.assertEqual(2, len(read))
+
+    def test_distinct_names_do_not_grow_symbol_table(self):
+        lines = ["name,sell_in,quality\n"] + ["Item %s,%s,10\n" % (number, number % 20) for number in range(5000)]
+        ids = len(SYMBOLS)
+
+        for _ in update_items(read_items(lines), chunk_size=100):
+            pass
+
+        self.assertLess(len(SYMBOLS) - ids, 300)
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            list(read_items(io.StringIO(""), "xml"))
+        with self.assertRaises(ValueError):
+            write_items([], io.StringIO(), "xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
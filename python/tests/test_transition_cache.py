@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from gilded_rose.gilded_rose import DEFAULT_REGISTRY, GildedRose, Item
+from gilded_rose.transition_cache import TransitionCache
+from tests.helpers import as_tuples, random_items
+
+
+def make_items(seed=3, count=3000):
+    return random_items(seed, count, (-3, 15), (0, 50))
+
+
+class TransitionCacheTest(unittest.TestCase):
+
+    def test_advance_matches_gilded_rose(self):
+        cache = TransitionCache()
+        items = make_items()
+        expected = make_items()
+
+        for days in (1, 1, 5, 0, 30):
+            cache.advance(items, days)
+            GildedRose(expected).advance(days)
+            self.assertEqual(as_tuples(expected), as_tuples(items), "%s days" % days)
+
+    def test_each_distinct_state_is_computed_once(self):
+        cache = TransitionCache()
+        items = [Item("Aged Brie", 5, 10) for _ in range(100)] + [Item("Conjured", 5, 10) for _ in range(50)]
+
+        cache.advance(items, 1)
+
+        self.assertEqual(2, cache.misses)
+        self.assertEqual(0, cache.hits)
+        self.assertEqual([(4, 11)] * 100 + [(4, 8)] * 50, [(item.sell_in, item.quality) for item in items])
+
+        cache.advance([Item("Aged Brie", 5, 10)], 1)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1 / 3, cache.hit_rate)
+
+    def test_lru_keeps_recently_used_entries(self):
+        brie = DEFAULT_REGISTRY.resolve("Aged Brie")
+        cache = TransitionCache(maxsize=2, policy="lru")
+
+        cache.transition(brie, 5, 1, 1)
+        cache.transition(brie, 5, 2, 1)
+        cache.transition(brie, 5, 1, 1)
+        cache.transition(brie, 5, 3, 1)
+
+        self.assertEqual(1, cache.evictions)
+        self.assertEqual(2, len(cache))
+        cache.transition(brie, 5, 1, 1)
+        self.assertEqual(2, cache.hits)
+
+    def test_fifo_evicts_oldest_entry(self):
+        brie = DEFAULT_REGISTRY.resolve("Aged Brie")
+        cache = TransitionCache(maxsize=2, policy="fifo")
+
+        cache.transition(brie, 5, 1, 1)
+        cache.transition(brie, 5, 2, 1)
+        cache.transition(brie, 5, 1, 1)
+        cache.transition(brie, 5, 3, 1)
+        cache.transition(brie, 5, 1, 1)
+
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.evictions)
+
+    def test_invalid_configuration_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TransitionCache(policy="random")
+        with self.assertRaises(ValueError):
+            TransitionCache(maxsize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()